@@ -46,42 +46,58 @@ def calculate_monthly_summaries(df):
 def calculate_mom_movements(monthly_summary):
     """Calculate month-over-month movements."""
     try:
-        movements = []
         sorted_data = monthly_summary.sort_values(['account', 'date'])
         
+        # Every account contributes one movement per month after its first,
+        # so the output size is known up front and filled positionally
+        n_rows = len(sorted_data) - sorted_data['account'].nunique()
+        account_out = np.empty(n_rows, dtype=object)
+        period_out = np.empty(n_rows, dtype=object)
+        current_out = np.empty(n_rows)
+        previous_out = np.empty(n_rows)
+        pct_change_out = np.empty(n_rows)
+        abs_change_out = np.empty(n_rows)
+        k = 0
+        
         for account in sorted_data['account'].unique():
             account_data = sorted_data[sorted_data['account'] == account].copy()
             account_data = account_data.sort_values('date')
             
-            for i in range(1, len(account_data)):
-                current_row = account_data.iloc[i]
-                previous_row = account_data.iloc[i-1]
-                
-                current_amount = current_row['amount']
-                previous_amount = previous_row['amount']
+            # Pull the columns out once; indexing numpy arrays avoids building
+            # a Series for every .iloc row access
+            amounts = account_data['amount'].to_numpy()
+            periods = account_data['year_month'].to_numpy()
+            
+            for i in range(1, len(amounts)):
+                current_amount = amounts[i]
+                previous_amount = amounts[i-1]
                 
                 if previous_amount != 0:
                     pct_change = ((current_amount - previous_amount) / abs(previous_amount)) * 100
                 else:
                     pct_change = 100.0 if current_amount > 0 else -100.0 if current_amount < 0 else 0.0
                 
-                abs_change = current_amount - previous_amount
-                
-                movements.append({
-                    'account': account,
-                    'current_period': current_row['year_month'],
-                    'current_amount': current_amount,
-                    'previous_amount': previous_amount,
-                    'percentage_change': pct_change,
-                    'absolute_change': abs_change,
-                    'movement_type': 'MoM'
-                })
+                account_out[k] = account
+                period_out[k] = periods[i]
+                current_out[k] = current_amount
+                previous_out[k] = previous_amount
+                pct_change_out[k] = pct_change
+                abs_change_out[k] = current_amount - previous_amount
+                k += 1
         
-        movements_df = pd.DataFrame(movements)
+        movements_df = pd.DataFrame({
+            'account': account_out[:k],
+            'current_period': pd.array(period_out[:k]),
+            'current_amount': current_out[:k],
+            'previous_amount': previous_out[:k],
+            'percentage_change': pct_change_out[:k],
+            'absolute_change': abs_change_out[:k],
+            'movement_type': 'MoM'
+        })
         return movements_df, {
             'success': True,
-            'total_movements': len(movements),
-            'accounts_analyzed': len(movements_df['account'].unique()) if len(movements) > 0 else 0
+            'total_movements': len(movements_df),
+            'accounts_analyzed': movements_df['account'].nunique()
         }
     except Exception as e:
         return None, {'success': False, 'error': str(e)}
@@ -89,45 +105,38 @@ def calculate_mom_movements(monthly_summary):
 def calculate_yoy_movements(monthly_summary):
     """Calculate year-over-year movements."""
     try:
-        movements = []
-        sorted_data = monthly_summary.sort_values(['account', 'date'])
+        # Pair each account-month with the same month one year earlier via a self-merge
+        keys = ['account', 'year', 'month']
+        previous_year = monthly_summary[keys + ['amount']].assign(year=monthly_summary['year'] + 1)
+        paired = monthly_summary[keys + ['year_month', 'amount']].merge(
+            previous_year, on=keys, suffixes=('', '_previous')
+        ).sort_values(['account', 'month', 'year'], kind='stable')
         
-        for account in sorted_data['account'].unique():
-            account_data = sorted_data[sorted_data['account'] == account].copy()
-            
-            for month in range(1, 13):
-                month_data = account_data[account_data['month'] == month].sort_values('year')
-                
-                for i in range(1, len(month_data)):
-                    current_row = month_data.iloc[i]
-                    previous_year_row = month_data.iloc[i-1]
-                    
-                    if current_row['year'] - previous_year_row['year'] == 1:
-                        current_amount = current_row['amount']
-                        previous_amount = previous_year_row['amount']
-                        
-                        if previous_amount != 0:
-                            pct_change = ((current_amount - previous_amount) / abs(previous_amount)) * 100
-                        else:
-                            pct_change = 100.0 if current_amount > 0 else -100.0 if current_amount < 0 else 0.0
-                        
-                        abs_change = current_amount - previous_amount
-                        
-                        movements.append({
-                            'account': account,
-                            'current_period': current_row['year_month'],
-                            'current_amount': current_amount,
-                            'previous_amount': previous_amount,
-                            'percentage_change': pct_change,
-                            'absolute_change': abs_change,
-                            'movement_type': 'YoY'
-                        })
+        current_amount = paired['amount'].to_numpy()
+        previous_amount = paired['amount_previous'].to_numpy()
+        abs_change = current_amount - previous_amount
         
-        movements_df = pd.DataFrame(movements)
+        # Zero previous amount maps to +/-100% by the sign of the current amount
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct_change = np.where(
+                previous_amount != 0,
+                abs_change / np.abs(previous_amount) * 100,
+                np.sign(current_amount) * 100.0
+            )
+        
+        movements_df = pd.DataFrame({
+            'account': paired['account'].to_numpy(),
+            'current_period': paired['year_month'].to_numpy(),
+            'current_amount': current_amount,
+            'previous_amount': previous_amount,
+            'percentage_change': pct_change,
+            'absolute_change': abs_change,
+            'movement_type': 'YoY'
+        })
         return movements_df, {
             'success': True,
-            'total_movements': len(movements),
-            'accounts_analyzed': len(movements_df['account'].unique()) if len(movements) > 0 else 0
+            'total_movements': len(movements_df),
+            'accounts_analyzed': movements_df['account'].nunique()
         }
     except Exception as e:
         return None, {'success': False, 'error': str(e)}
@@ -229,13 +238,24 @@ def rank_movements_by_significance(movements_df):
         if movements_df is None or len(movements_df) == 0:
             return None, {'success': False, 'error': 'No movements to rank'}
         
-        ranked_movements = movements_df.sort_values('materiality_score', ascending=False).copy()
-        ranked_movements['rank'] = range(1, len(ranked_movements) + 1)
+        # A single stable argsort on negated scores orders and ranks in one pass
+        scores = movements_df['materiality_score'].to_numpy()
+        order = np.argsort(-scores, kind='stable')
+        ranked_movements = movements_df.take(order).assign(rank=np.arange(1, len(order) + 1))
+        
+        # Significance counts are reported only when the input is already flagged
+        significance_counts = {}
+        if 'significance' in movements_df:
+            levels, counts = np.unique(movements_df['significance'].to_numpy(dtype=str), return_counts=True)
+            significance_counts = dict(zip(levels, counts.tolist()))
         
         return ranked_movements, {
             'success': True,
             'total_movements': len(ranked_movements),
-            'top_movement_score': ranked_movements['materiality_score'].iloc[0] if len(ranked_movements) > 0 else 0
+            'top_movement_score': scores[order[0]],
+            'critical_movements': significance_counts.get('Critical', 0),
+            'high_movements': significance_counts.get('High', 0),
+            'medium_movements': significance_counts.get('Medium', 0)
         }
     except Exception as e:
         return None, {'success': False, 'error': str(e)}
@@ -3,15 +3,92 @@ Security fixes for Story 3.2 - AI Commentary Generation
 Addresses critical security vulnerabilities identified in QA review.
 """
 
+import io
 import re
 import os
 import logging
+import functools
 from typing import Optional, Tuple
 
 # Security Configuration
 MAX_FILENAME_LENGTH = 255
 ALLOWED_FILE_EXTENSIONS = {'.csv', '.xlsx', '.xls'}
 MAX_FILE_SIZE_MB = 50
+_MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB * 1024 * 1024
+
+# Predefined user-facing error messages that never expose internal details
+_SAFE_MESSAGES = {
+    'openai_client': 'Failed to initialize AI service. Please check your configuration.',
+    'file_processing': 'Error processing uploaded file. Please verify file format and try again.',
+    'file_corrupted': 'Uploaded file appears to be corrupted. Please try uploading again.',
+    'api_call': 'AI service temporarily unavailable. Using fallback analysis.',
+    'general': 'An error occurred. Please try again or contact support.'
+}
+
+# OpenAI-style key: 'sk-' prefix, at least 20 characters, no suspicious characters
+_VALID_API_KEY = re.compile(r'sk-[a-zA-Z0-9\-_]{17,}\Z')
+
+# Characters rejected in uploaded filenames
+_DANGEROUS_FILENAME_CHARS = frozenset('<>:"|?*\0')
+
+# Translation table mapping characters that are unsafe in filenames to '_'
+_UNSAFE_FILENAME_CHARS = str.maketrans({char: '_' for char in '<>:"/|?*\\\0'})
+
+# API keys and tokens are redacted in their own passes first: in a single
+# alternation an earlier URL or token match would swallow part of them.
+_SANITIZE_API_KEY = re.compile(r'sk-[a-zA-Z0-9]{10,}', re.IGNORECASE)
+_SANITIZE_TOKEN = re.compile(r'token["\s]*[:=]["\s]*[a-zA-Z0-9]+', re.IGNORECASE)
+
+# Remaining sensitive patterns, fused into one alternation so the message is
+# scanned once; the matching group selects the replacement.
+_SANITIZE_COMBINED = re.compile(
+    r'(?P<url>https?://[^\s]+)'
+    r'|(?P<path>/(?=[a-zA-Z0-9_\-\.])[a-zA-Z0-9/_\-]*(?:\.+[a-zA-Z0-9/_\-]+)*)'
+    r'|(?P<email>\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b)',
+    re.IGNORECASE
+)
+
+# Matches wherever any of the patterns above would, for the no-redaction fast path
+_SANITIZE_ANY = re.compile(
+    '|'.join(p.pattern for p in (_SANITIZE_API_KEY, _SANITIZE_TOKEN, _SANITIZE_COMBINED)),
+    re.IGNORECASE
+)
+_SANITIZE_REPLACEMENTS = {
+    'url': '[URL_REDACTED]',
+    'path': '[PATH_REDACTED]',
+    'email': '[EMAIL_REDACTED]',
+}
+
+
+def _configure_loggers() -> Tuple[logging.Logger, logging.Logger]:
+    """
+    Configure the named security and API-failure loggers once at import.
+    
+    Returns:
+        tuple: (security_logger, api_failure_logger)
+    """
+    security_logger = logging.getLogger('security')
+    # Security events are emitted at INFO and above
+    security_logger.setLevel(logging.INFO)
+    
+    # API failures get their own handler so importing this module never
+    # configures the root logger; that is left to the application entry point
+    api_failure_logger = logging.getLogger('api_failures')
+    api_failure_logger.setLevel(logging.ERROR)
+    if not api_failure_logger.handlers:
+        api_failure_logger.addHandler(logging.StreamHandler())
+        api_failure_logger.propagate = False
+    
+    return security_logger, api_failure_logger
+
+
+_SECURITY_LOGGER, _API_FAILURE_LOGGER = _configure_loggers()
+
+
+def _redact_match(match: re.Match) -> str:
+    """Return the redaction text for whichever sensitive pattern matched."""
+    return _SANITIZE_REPLACEMENTS[match.lastgroup]
+
 
 class SecurityUtils:
     """Utility class for security-related functions."""
@@ -27,20 +104,14 @@ class SecurityUtils:
         Returns:
             str: Sanitized error message safe for user display
         """
-        # Remove potential API keys (sk-...)
-        sanitized = re.sub(r'sk-[a-zA-Z0-9]{10,}', '[API_KEY_REDACTED]', error_message)
+        # Fast path: most messages contain nothing sensitive
+        if _SANITIZE_ANY.search(error_message) is None:
+            return error_message
         
-        # Remove file paths
-        sanitized = re.sub(r'/[a-zA-Z0-9/_\-\.]+', '[PATH_REDACTED]', sanitized)
-        
-        # Remove potential tokens or secrets
-        sanitized = re.sub(r'token["\s]*[:=]["\s]*[a-zA-Z0-9]+', 'token=[REDACTED]', sanitized, flags=re.IGNORECASE)
-        
-        # Remove email addresses 
-        sanitized = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', '[EMAIL_REDACTED]', sanitized)
-        
-        # Remove URLs
-        sanitized = re.sub(r'https?://[^\s]+', '[URL_REDACTED]', sanitized)
+        # Redact API keys and tokens, then URLs, file paths and emails in one pass
+        sanitized = _SANITIZE_API_KEY.sub('[API_KEY_REDACTED]', error_message)
+        sanitized = _SANITIZE_TOKEN.sub('token=[REDACTED]', sanitized)
+        sanitized = _SANITIZE_COMBINED.sub(_redact_match, sanitized)
         
         return sanitized
     
@@ -55,15 +126,7 @@ class SecurityUtils:
         Returns:
             str: Safe error message for user display
         """
-        safe_messages = {
-            'openai_client': 'Failed to initialize AI service. Please check your configuration.',
-            'file_processing': 'Error processing uploaded file. Please verify file format and try again.',
-            'file_corrupted': 'Uploaded file appears to be corrupted. Please try uploading again.',
-            'api_call': 'AI service temporarily unavailable. Using fallback analysis.',
-            'general': 'An error occurred. Please try again or contact support.'
-        }
-        
-        return safe_messages.get(error_type, safe_messages['general'])
+        return _SAFE_MESSAGES.get(error_type, _SAFE_MESSAGES['general'])
     
     @staticmethod
     def validate_api_key(api_key: str) -> Tuple[bool, str]:
@@ -79,6 +142,10 @@ class SecurityUtils:
         if not api_key:
             return False, "API key is required"
         
+        # Prefix, minimum length and allowed characters in a single match
+        if _VALID_API_KEY.match(api_key):
+            return True, "Valid"
+        
         # Check basic format (OpenAI keys start with 'sk-')
         if not api_key.startswith('sk-'):
             return False, "Invalid API key format"
@@ -87,13 +154,10 @@ class SecurityUtils:
         if len(api_key) < 20:
             return False, "API key too short"
         
-        # Check for suspicious characters
-        if not re.match(r'^sk-[a-zA-Z0-9\-_]+$', api_key):
-            return False, "API key contains invalid characters"
-        
-        return True, "Valid"
+        return False, "API key contains invalid characters"
     
     @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def validate_filename(filename: str) -> Tuple[bool, str]:
         """
         Validate uploaded filename for security.
@@ -107,30 +171,33 @@ class SecurityUtils:
         if not filename:
             return False, "Filename is required"
         
-        # Check length
-        if len(filename) > MAX_FILENAME_LENGTH:
-            return False, f"Filename too long (max {MAX_FILENAME_LENGTH} characters)"
-        
-        # Check for path traversal attempts
+        # Check for path traversal attempts (rejects most hostile input first)
         if '..' in filename or '/' in filename or '\\' in filename:
             return False, "Invalid filename: path traversal detected"
         
         # Check for dangerous characters
-        dangerous_chars = ['<', '>', ':', '"', '|', '?', '*', '\0']
-        if any(char in filename for char in dangerous_chars):
+        if not _DANGEROUS_FILENAME_CHARS.isdisjoint(filename):
             return False, "Filename contains invalid characters"
         
+        # Check length
+        if len(filename) > MAX_FILENAME_LENGTH:
+            return False, f"Filename too long (max {MAX_FILENAME_LENGTH} characters)"
+        
         # Check file extension
-        if '.' not in filename:
+        # Everything after the last '.' is the extension, so a bare '.csv' is accepted
+        _, dot, suffix = filename.rpartition('.')
+        if not dot:
             return False, "File must have an extension"
         
-        extension = '.' + filename.split('.')[-1].lower()
+        extension = '.' + suffix.lower()
+        
         if extension not in ALLOWED_FILE_EXTENSIONS:
             return False, f"File type not allowed. Allowed: {', '.join(ALLOWED_FILE_EXTENSIONS)}"
         
         return True, "Valid"
     
     @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def sanitize_filename(filename: str) -> str:
         """
         Sanitize filename by removing dangerous characters.
@@ -141,10 +208,10 @@ class SecurityUtils:
         Returns:
             str: Sanitized filename
         """
-        # Remove dangerous characters
-        sanitized = re.sub(r'[<>:"/|?*\\\0]', '_', filename)
+        # Remove dangerous characters (single translate pass, no regex)
+        sanitized = filename.translate(_UNSAFE_FILENAME_CHARS)
         
-        # Remove path traversal
+        # Remove path traversal ('..' survives the translation above)
         sanitized = sanitized.replace('..', '_')
         
         # Limit length
@@ -163,22 +230,19 @@ class SecurityUtils:
         Args:
             event_type: Type of security event
             details: Event details (will be sanitized)
-            level: Log level (WARNING, ERROR, CRITICAL)
+            level: Log level (INFO, WARNING, ERROR, CRITICAL)
         """
-        logger = logging.getLogger('security')
-        logger.setLevel(getattr(logging, level))
+        logger = _SECURITY_LOGGER
+        level_int = getattr(logging, level, logging.WARNING)
+        
+        # Skip sanitization entirely for events the logger would drop
+        if not logger.isEnabledFor(level_int):
+            return
         
         # Sanitize details before logging
         sanitized_details = SecurityUtils.sanitize_error_message(details)
         
-        log_message = f"SECURITY_EVENT: {event_type} - {sanitized_details}"
-        
-        if level == 'CRITICAL':
-            logger.critical(log_message)
-        elif level == 'ERROR':
-            logger.error(log_message)
-        else:
-            logger.warning(log_message)
+        logger.log(level_int, f"SECURITY_EVENT: {event_type} - {sanitized_details}")
 
 
 def secure_get_openai_client():
@@ -219,11 +283,7 @@ def secure_log_api_failure(error_message: str, movement_data: dict = None):
         error_message: Error message from API call
         movement_data: Optional movement data context
     """
-    import logging
-    
-    # Configure security logging
-    logging.basicConfig(level=logging.ERROR)
-    logger = logging.getLogger('api_failures')
+    logger = _API_FAILURE_LOGGER
     
     # Sanitize error message before logging
     sanitized_error = SecurityUtils.sanitize_error_message(error_message)
@@ -233,7 +293,7 @@ def secure_log_api_failure(error_message: str, movement_data: dict = None):
         # Only log non-sensitive account information
         account = movement_data.get('account', 'Unknown')
         # Sanitize account name too (in case it contains sensitive info)
-        account = re.sub(r'[<>:"/|?*\\\0]', '_', account)[:50]  # Limit length
+        account = account.translate(_UNSAFE_FILENAME_CHARS)[:50]  # Limit length
         log_entry += f" | Account: {account}"
     
     logger.error(log_entry)
@@ -260,12 +320,14 @@ def secure_file_upload_handler(uploaded_file) -> Tuple[bool, str, Optional[objec
         SecurityUtils.log_security_event('INVALID_FILENAME', f"File: {uploaded_file.name}, Error: {name_error}")
         return False, f"Invalid filename: {name_error}", None
     
-    # Check file size
-    file_size = len(uploaded_file.getvalue())
-    max_size_bytes = MAX_FILE_SIZE_MB * 1024 * 1024
+    # Check file size without reading the upload into memory
+    file_size = getattr(uploaded_file, 'size', None)
+    if file_size is None:
+        file_size = uploaded_file.seek(0, io.SEEK_END)
+        uploaded_file.seek(0)
     
-    if file_size > max_size_bytes:
-        SecurityUtils.log_security_event('FILE_TOO_LARGE', f"Size: {file_size} bytes, Limit: {max_size_bytes} bytes")
+    if file_size > _MAX_FILE_SIZE_BYTES:
+        SecurityUtils.log_security_event('FILE_TOO_LARGE', f"Size: {file_size} bytes, Limit: {_MAX_FILE_SIZE_BYTES} bytes")
         return False, f"File too large. Maximum size: {MAX_FILE_SIZE_MB}MB", None
     
     if file_size == 0:
@@ -291,6 +353,12 @@ def test_security_utils():
     assert '[API_KEY_REDACTED]' in sanitized
     assert '[PATH_REDACTED]' in sanitized
     
+    # Keys and tokens are not swallowed by a neighbouring match
+    sanitized = SecurityUtils.sanitize_error_message("token: abc123sk-abcdefghijklmnop")
+    assert sanitized == "token=[REDACTED][API_KEY_REDACTED]"
+    sanitized = SecurityUtils.sanitize_error_message("GET https://api.example.com/v1/auth?token: abc123 failed")
+    assert sanitized == "GET [URL_REDACTED] failed"
+    
     # Test API key validation
     valid_key = "sk-abc123def456ghi789"
     is_valid, _ = SecurityUtils.validate_api_key(valid_key)
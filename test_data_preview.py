@@ -78,7 +78,7 @@ class TestDataPreviewComponents:
     def test_summary_statistics_calculation(self):
         """Test calculation of summary statistics"""
         df = self.sample_data.copy()
-        df['date'] = pd.to_datetime(df['date'])
+        df['date'] = pd.to_datetime(df['date'], format='%Y-%m-%d')
         df['amount'] = pd.to_numeric(df['amount'])
         
         # Test row count
@@ -105,18 +105,18 @@ class TestDataPreviewComponents:
         """Test generation of column information for display"""
         df = self.sample_data.copy()
         
-        col_info = []
-        for col in df.columns:
-            dtype_str = str(df[col].dtype)
-            non_null = df[col].count()
-            total = len(df)
-            completeness = (non_null / total) * 100
-            col_info.append({
+        # Non-null counts and dtypes for all columns in one call each
+        non_null_counts = df.count()
+        completeness = non_null_counts / len(df) * 100
+        col_info = [
+            {
                 'Column': col,
-                'Data Type': dtype_str,
+                'Data Type': str(dtype),
                 'Non-Null Count': f"{non_null:,}",
-                'Completeness': f"{completeness:.1f}%"
-            })
+                'Completeness': f"{pct:.1f}%"
+            }
+            for col, dtype, non_null, pct in zip(df.columns, df.dtypes, non_null_counts, completeness)
+        ]
         
         assert len(col_info) == 4
         assert col_info[0]['Column'] == 'date'
@@ -138,22 +138,22 @@ class TestDataPreviewComponents:
         # Test outlier detection logic for amounts
         df['amount'] = pd.to_numeric(df['amount'], errors='coerce')
         amounts = df['amount'].dropna()
-        Q1 = amounts.quantile(0.25)
-        Q3 = amounts.quantile(0.75)
+        Q1, Q3 = np.quantile(amounts.to_numpy(), [0.25, 0.75])
         IQR = Q3 - Q1
         
         outlier_threshold_upper = Q3 + 1.5 * IQR
         outlier_threshold_lower = Q1 - 1.5 * IQR
         
         # 999999.99 should be detected as outlier
-        outliers = amounts[(amounts < outlier_threshold_lower) | (amounts > outlier_threshold_upper)]
-        assert 999999.99 in outliers.values
+        values = amounts.to_numpy()
+        outlier_mask = np.logical_or(values < outlier_threshold_lower, values > outlier_threshold_upper)
+        assert 999999.99 in values[outlier_mask]
 
     def test_csv_download_data_generation(self):
         """Test CSV data generation for download"""
         df = self.sample_data.copy()
         
-        # Test CSV generation
+        # Test CSV generation (DataFrame.to_csv, as the download handler serializes it)
         csv_data = df.to_csv(index=False)
         
         # Verify CSV structure
@@ -162,18 +162,20 @@ class TestDataPreviewComponents:
         assert '2024-01-02,Revenue,-2500.75,Sales revenue' in csv_data
         
         # Test timestamp generation for filename
-        timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         csv_filename = f"processed_data_{timestamp}.csv"
         assert csv_filename.startswith("processed_data_")
         assert csv_filename.endswith(".csv")
 
     def test_excel_download_data_generation(self):
         """Test Excel data generation for download"""
+        pytest.importorskip('xlsxwriter')
         df = self.sample_data.copy()
         
         # Test Excel generation
         excel_buffer = io.BytesIO()
-        with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
+        with pd.ExcelWriter(excel_buffer, engine='xlsxwriter',
+                            engine_kwargs={'options': {'constant_memory': True}}) as writer:
             df.to_excel(writer, index=False, sheet_name='Processed Data')
         excel_data = excel_buffer.getvalue()
         
@@ -182,7 +184,7 @@ class TestDataPreviewComponents:
         assert isinstance(excel_data, bytes)
         
         # Test filename generation
-        timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         excel_filename = f"processed_data_{timestamp}.xlsx"
         assert excel_filename.startswith("processed_data_")
         assert excel_filename.endswith(".xlsx")
@@ -252,14 +254,14 @@ class TestDataPreviewComponents:
         """Test date parsing with various edge cases"""
         # Test valid dates
         valid_dates = pd.Series(['2024-01-01', '2024-12-31', '2023-06-15'])
-        parsed_dates = pd.to_datetime(valid_dates)
+        parsed_dates = pd.to_datetime(valid_dates, format='%Y-%m-%d')
         assert len(parsed_dates) == 3
         assert not parsed_dates.isna().any()
         
         # Test invalid dates that should handle gracefully
         mixed_dates = pd.Series(['2024-01-01', 'invalid_date', '2024-12-31', None])
         try:
-            parsed_mixed = pd.to_datetime(mixed_dates, errors='coerce')
+            parsed_mixed = pd.to_datetime(mixed_dates, format='%Y-%m-%d', errors='coerce')
             assert parsed_mixed.isna().sum() == 2  # invalid_date and None should be NaT
         except:
             # If parsing fails completely, that's acceptable too
@@ -6,6 +6,7 @@ Coverage requirement: 80%
 """
 
 import unittest
+import pytest
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -26,10 +27,12 @@ from main import (
 class TestMovementDetectionEngine(unittest.TestCase):
     """Test suite for movement detection engine functions."""
     
-    def setUp(self):
-        """Set up test data for movement detection tests."""
+    @classmethod
+    def setUpClass(cls):
+        """Set up shared test data for movement detection tests."""
+        # Reference frames are built once per class; tests copy before use
         # Create sample financial data for testing
-        self.sample_data = pd.DataFrame({
+        cls.sample_data = pd.DataFrame({
             'date': [
                 '2022-01-01', '2022-01-15', '2022-02-01', '2022-02-15',
                 '2022-03-01', '2022-03-15', '2023-01-01', '2023-01-15',
@@ -47,7 +50,7 @@ class TestMovementDetectionEngine(unittest.TestCase):
         })
         
         # Create sample data with multiple accounts
-        self.multi_account_data = pd.DataFrame({
+        cls.multi_account_data = pd.DataFrame({
             'date': [
                 '2022-01-01', '2022-02-01', '2022-03-01', '2023-01-01', '2023-02-01', '2023-03-01',
                 '2022-01-01', '2022-02-01', '2022-03-01', '2023-01-01', '2023-02-01', '2023-03-01'
@@ -63,7 +66,7 @@ class TestMovementDetectionEngine(unittest.TestCase):
         })
         
         # Create sample monthly summary data
-        self.sample_monthly_summary = pd.DataFrame({
+        cls.sample_monthly_summary = pd.DataFrame({
             'account': ['Revenue', 'Revenue', 'Revenue', 'Revenue'],
             'year_month': pd.to_datetime(['2022-01', '2022-02', '2022-03', '2023-01']).to_period('M'),
             'amount': [15000, 18000, 22500, 16500],
@@ -74,7 +77,7 @@ class TestMovementDetectionEngine(unittest.TestCase):
     
     def test_calculate_monthly_summaries_success(self):
         """Test successful calculation of monthly summaries."""
-        result, stats = calculate_monthly_summaries(self.sample_data)
+        result, stats = calculate_monthly_summaries(self.sample_data.copy())
         
         self.assertIsNotNone(result)
         self.assertTrue(stats['success'])
@@ -100,7 +103,7 @@ class TestMovementDetectionEngine(unittest.TestCase):
     
     def test_calculate_mom_movements_success(self):
         """Test successful MoM movement calculations."""
-        result, stats = calculate_mom_movements(self.sample_monthly_summary)
+        result, stats = calculate_mom_movements(self.sample_monthly_summary.copy())
         
         self.assertIsNotNone(result)
         self.assertTrue(stats['success'])
@@ -190,16 +193,15 @@ class TestMovementDetectionEngine(unittest.TestCase):
         })
         
         # Create multiple entries per account to simulate monthly summary
-        expanded_data = []
-        for _, row in test_data.iterrows():
-            for i in range(1, 4):  # Create 3 months of data for each
-                expanded_data.append({
-                    'account': row['account'],
-                    'date': row['date'] - timedelta(days=30 * i),
-                    'amount': 1000 * i
-                })
-        
-        monthly_summary = pd.DataFrame(expanded_data)
+        months_back = np.arange(1, 4)  # Create 3 months of data for each
+        monthly_summary = pd.DataFrame({
+            'account': np.repeat(test_data['account'].to_numpy(), len(months_back)),
+            'date': (
+                np.repeat(test_data['date'].to_numpy(), len(months_back))
+                - np.tile(months_back * np.timedelta64(30, 'D'), len(test_data))
+            ),
+            'amount': np.tile(1000 * months_back, len(test_data))
+        })
         
         result, stats = detect_new_and_discontinued_accounts(monthly_summary)
         
@@ -233,9 +235,16 @@ class TestMovementDetectionEngine(unittest.TestCase):
         self.assertEqual(len(result), 3)
         self.assertIn('rank', result.columns)
         
-        # Check that highest materiality score is ranked first
-        self.assertEqual(result.iloc[0]['rank'], 1)
-        self.assertEqual(result.iloc[0]['materiality_score'], 90.0)
+        # Check that movements are ranked by descending materiality score
+        expected = pd.DataFrame({
+            'rank': [1, 2, 3],
+            'materiality_score': [90.0, 75.0, 50.0]
+        })
+        pd.testing.assert_frame_equal(
+            result[['rank', 'materiality_score']].reset_index(drop=True),
+            expected,
+            check_dtype=False
+        )
         
         # Verify ranking statistics
         self.assertEqual(stats['critical_movements'], 1)
@@ -249,9 +258,10 @@ class TestMovementDetectionEngine(unittest.TestCase):
         self.assertIsNone(result)
         self.assertFalse(stats['success'])
     
+    @pytest.mark.slow
     def test_run_movement_detection_engine_success(self):
         """Test complete movement detection engine execution."""
-        result = run_movement_detection_engine(self.multi_account_data)
+        result = run_movement_detection_engine(self.multi_account_data.copy())
         
         self.assertTrue(result['success'])
         self.assertIsNotNone(result['monthly_summary'])
@@ -261,6 +271,7 @@ class TestMovementDetectionEngine(unittest.TestCase):
         # Check that monthly summary was created
         self.assertTrue(result['summary_stats']['monthly_summary']['success'])
     
+    @pytest.mark.slow
     def test_run_movement_detection_engine_invalid_data(self):
         """Test movement detection engine with invalid data."""
         invalid_data = pd.DataFrame({
@@ -297,7 +308,7 @@ class TestMovementDetectionEngine(unittest.TestCase):
     def test_movement_type_consistency(self):
         """Test that movement types are correctly assigned."""
         # Test MoM movements
-        mom_result, _ = calculate_mom_movements(self.sample_monthly_summary)
+        mom_result, _ = calculate_mom_movements(self.sample_monthly_summary.copy())
         if len(mom_result) > 0:
             self.assertTrue(all(mom_result['movement_type'] == 'MoM'))
         
@@ -6,6 +6,9 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
+# Movement types are compared by category code rather than by string
+MOVEMENT_TYPES = pd.CategoricalDtype(['MoM', 'YoY'])
+
 # Import only the movement detection functions we need to test
 def calculate_monthly_summaries(df):
     """Calculate monthly summaries for each account."""
@@ -13,18 +16,34 @@ def calculate_monthly_summaries(df):
         if not all(col in df.columns for col in ['date', 'account', 'amount']):
             return None, {'success': False, 'error': 'Required columns missing'}
         
-        df_copy = df.copy()
-        df_copy['date'] = pd.to_datetime(df_copy['date'])
-        df_copy['year_month'] = df_copy['date'].dt.to_period('M')
-        
-        monthly_summary = df_copy.groupby(['account', 'year_month']).agg({
-            'amount': 'sum',
-            'date': 'max'
-        }).reset_index()
+        # Truncate dates to month starts as plain datetime64 values; month
+        # numbers since the epoch give year and month without Period objects
+        year_month = pd.to_datetime(df['date']).to_numpy().astype('datetime64[M]')
         
-        monthly_summary['date'] = monthly_summary['year_month'].dt.start_time
-        monthly_summary['year'] = monthly_summary['year_month'].dt.year
-        monthly_summary['month'] = monthly_summary['year_month'].dt.month
+        # Build only the grouping columns rather than copying the whole input
+        monthly_summary = (
+            df[['account', 'amount']]
+            .assign(
+                account=lambda d: d['account'].astype('category'),
+                amount=lambda d: pd.to_numeric(d['amount']),
+                year_month=year_month
+            )
+            # Only amounts are aggregated; the month start becomes the summary date
+            .groupby(['account', 'year_month'], sort=False, observed=True)['amount'].sum()
+            .reset_index()
+        )
+        months_since_epoch = monthly_summary['year_month'].to_numpy().astype('datetime64[M]').astype(np.int64)
+        monthly_summary = (
+            monthly_summary
+            .assign(
+                date=monthly_summary['year_month'],
+                year=months_since_epoch // 12 + 1970,
+                month=months_since_epoch % 12 + 1
+            )
+            # Sorted once here so downstream movement calculations need not re-sort
+            .sort_values(['account', 'year_month'])
+            .reset_index(drop=True)
+        )
         
         return monthly_summary, {
             'success': True,
@@ -36,95 +55,110 @@ def calculate_monthly_summaries(df):
         return None, {'success': False, 'error': str(e)}
 
 def calculate_mom_movements(monthly_summary):
-    """Calculate month-over-month movements."""
+    """Calculate month-over-month movements.
+    
+    Input already ordered by account and period (as returned by
+    ``calculate_monthly_summaries``) is used as is; anything else is sorted.
+    """
     try:
-        movements = []
-        sorted_data = monthly_summary.sort_values(['account', 'date'])
+        sorted_data = monthly_summary
+        accounts = sorted_data['account'].astype('category').array
+        account_codes = accounts.codes
         
-        for account in sorted_data['account'].unique():
-            account_data = sorted_data[sorted_data['account'] == account].copy()
-            account_data = account_data.sort_values('date')
-            
-            for i in range(1, len(account_data)):
-                current_row = account_data.iloc[i]
-                previous_row = account_data.iloc[i-1]
-                
-                current_amount = current_row['amount']
-                previous_amount = previous_row['amount']
-                
-                if previous_amount != 0:
-                    pct_change = ((current_amount - previous_amount) / abs(previous_amount)) * 100
-                else:
-                    pct_change = 100.0 if current_amount > 0 else -100.0 if current_amount < 0 else 0.0
-                
-                abs_change = current_amount - previous_amount
-                
-                movements.append({
-                    'account': account,
-                    'current_period': current_row['year_month'],
-                    'current_amount': current_amount,
-                    'previous_amount': previous_amount,
-                    'percentage_change': pct_change,
-                    'absolute_change': abs_change,
-                    'movement_type': 'MoM'
-                })
+        # Only sort when a row is out of (account, date) order
+        code_step = np.diff(account_codes.astype(np.int64))
+        dates = sorted_data['date'].to_numpy()
+        in_order = (code_step > 0) | ((code_step == 0) & (dates[1:] >= dates[:-1]))
+        if not in_order.all():
+            sorted_data = monthly_summary.sort_values(['account', 'date'], kind='stable')
+            accounts = sorted_data['account'].astype('category').array
+            account_codes = accounts.codes
+        
+        # Rows are grouped by account, so a row has a previous month to
+        # compare whenever it shares its account code with the row above
+        has_previous = np.zeros(len(account_codes), dtype=bool)
+        has_previous[1:] = account_codes[1:] == account_codes[:-1]
+        current_idx = np.flatnonzero(has_previous)
+        
+        amounts = sorted_data['amount'].to_numpy()
+        current_amount = amounts[current_idx]
+        previous_amount = amounts[current_idx - 1]
+        abs_change = current_amount - previous_amount
+        
+        # Zero previous amount maps to +/-100% by the sign of the current amount
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct_change = np.where(
+                previous_amount != 0,
+                abs_change / np.abs(previous_amount) * 100,
+                np.sign(current_amount) * 100.0
+            )
         
-        movements_df = pd.DataFrame(movements)
+        movements_df = pd.DataFrame({
+            'account': accounts.take(current_idx),
+            'current_period': sorted_data['year_month'].to_numpy()[current_idx],
+            'current_amount': current_amount,
+            'previous_amount': previous_amount,
+            'percentage_change': pct_change,
+            'absolute_change': abs_change,
+            'movement_type': pd.Categorical.from_codes(
+                np.zeros(len(current_idx), dtype=np.int8), dtype=MOVEMENT_TYPES
+            )
+        })
         return movements_df, {
             'success': True,
-            'total_movements': len(movements),
-            'accounts_analyzed': len(movements_df['account'].unique()) if len(movements) > 0 else 0
+            'total_movements': len(movements_df),
+            'accounts_analyzed': movements_df['account'].nunique()
         }
     except Exception as e:
         return None, {'success': False, 'error': str(e)}
 
-def apply_movement_thresholds(movements_df, mom_threshold=10.0, yoy_threshold=15.0):
-    """Apply threshold-based flagging."""
+def apply_movement_thresholds(movements_df, mom_threshold=10.0, yoy_threshold=15.0, score_dtype=np.float64):
+    """Apply threshold-based flagging.
+    
+    Materiality scores are computed in ``score_dtype`` (float64 by default);
+    pass ``np.float32`` to trade score precision for memory.
+    """
     try:
         if movements_df is None or len(movements_df) == 0:
             return None, {'success': False, 'error': 'No movements to analyze'}
         
-        flagged_movements = movements_df.copy()
-        
-        def get_significance_flag(row):
-            threshold = mom_threshold if row['movement_type'] == 'MoM' else yoy_threshold
-            abs_pct_change = abs(row['percentage_change'])
-            
-            if abs_pct_change >= threshold * 3:
-                return 'Critical'
-            elif abs_pct_change >= threshold * 2:
-                return 'High'
-            elif abs_pct_change >= threshold:
-                return 'Medium'
-            else:
-                return 'Low'
-        
-        flagged_movements['significance'] = flagged_movements.apply(get_significance_flag, axis=1)
+        # Per-row threshold by movement type, then tier by multiples of it
+        movement_codes = movements_df['movement_type'].astype(MOVEMENT_TYPES).cat.codes.to_numpy()
+        abs_pct_change = np.abs(movements_df['percentage_change'].to_numpy(dtype=float))
+        threshold = np.where(movement_codes == 0, mom_threshold, yoy_threshold)
         
-        significant_movements = flagged_movements[
-            ((flagged_movements['movement_type'] == 'MoM') & (abs(flagged_movements['percentage_change']) >= mom_threshold)) |
-            ((flagged_movements['movement_type'] == 'YoY') & (abs(flagged_movements['percentage_change']) >= yoy_threshold))
-        ].copy()
+        flagged_movements = movements_df.assign(significance=np.select(
+            [abs_pct_change >= threshold * 3, abs_pct_change >= threshold * 2, abs_pct_change >= threshold],
+            ['Critical', 'High', 'Medium'],
+            default='Low'
+        ))
         
-        if len(significant_movements) > 0:
-            max_abs_change = abs(significant_movements['absolute_change']).max()
-            if max_abs_change > 0:
-                significant_movements['abs_score'] = abs(significant_movements['absolute_change']) / max_abs_change * 100
-            else:
-                significant_movements['abs_score'] = 0
-            
-            significant_movements['materiality_score'] = (
-                abs(significant_movements['percentage_change']) * 0.6 + 
-                significant_movements['abs_score'] * 0.4
-            )
+        # Code -1 marks a movement type outside MOVEMENT_TYPES
+        is_significant = (abs_pct_change >= threshold) & (movement_codes >= 0)
+        significant_movements = flagged_movements[is_significant]
         
-        return significant_movements, {
+        stats = {
             'success': True,
             'total_movements_analyzed': len(flagged_movements),
             'significant_movements_found': len(significant_movements),
             'mom_threshold_applied': mom_threshold,
             'yoy_threshold_applied': yoy_threshold
         }
+        if len(significant_movements) == 0:
+            return significant_movements, stats
+        
+        pct_score = abs_pct_change[is_significant].astype(score_dtype) * score_dtype(0.6)
+        abs_change = np.abs(significant_movements['absolute_change'].to_numpy(dtype=score_dtype))
+        max_abs_change = abs_change.max()
+        if max_abs_change > 0:
+            abs_score = abs_change / max_abs_change * score_dtype(100)
+            materiality_score = pct_score + abs_score * score_dtype(0.4)
+        else:
+            # No absolute movement to weigh, so the score is the percentage term alone
+            abs_score = score_dtype(0)
+            materiality_score = pct_score
+        
+        return significant_movements.assign(abs_score=abs_score, materiality_score=materiality_score), stats
     except Exception as e:
         return None, {'success': False, 'error': str(e)}
 
@@ -155,6 +189,7 @@ def test_movement_detection():
     else:
         print(f"❌ Failed: {monthly_stats['error']}")
     print()
+    assert monthly_stats['success'], monthly_stats.get('error')
     
     # Test 2: MoM movements
     print("2. Testing MoM Movements...")
@@ -168,6 +203,7 @@ def test_movement_detection():
                     print(f"   - {row['account']}: {row['percentage_change']:+.1f}% change (${row['absolute_change']:+,.0f})")
         else:
             print(f"❌ Failed: {mom_stats['error']}")
+        assert mom_stats['success'], mom_stats.get('error')
     print()
     
     # Test 3: Threshold application
@@ -183,6 +219,7 @@ def test_movement_detection():
                     print(f"   - {row['account']}: {row['percentage_change']:+.1f}% ({row['significance']}) Score: {row['materiality_score']:.1f}")
         else:
             print(f"❌ Failed: {threshold_stats['error']}")
+        assert threshold_stats['success'], threshold_stats.get('error')
     print()
     
     # Test 4: Edge cases
@@ -202,6 +239,7 @@ def test_movement_detection():
                 print(f"   Zero-division handling: {edge_movements.iloc[-1]['percentage_change']:.1f}%")
         else:
             print(f"❌ Edge case failed: {edge_stats['error']}")
+        assert edge_stats['success'], edge_stats.get('error')
     print()
     
     print("=== Movement Detection Test Complete ===")
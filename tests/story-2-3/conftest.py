@@ -0,0 +1,121 @@
+"""
+Shared fixtures for Story 2.3 data processing tests.
+"""
+
+import functools
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Import main.py once for the whole session rather than once per test module
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import main as _main
+
+
+@pytest.fixture(scope="session")
+def pipeline():
+    """The main module, exposing the data processing pipeline functions."""
+    return _main
+
+
+@pytest.fixture(scope="session")
+def standardize_accounts(pipeline):
+    """Run standardize_account_names once per distinct tuple of account names.
+    
+    Results are shared between callers and must not be modified.
+    """
+    @functools.lru_cache(maxsize=None)
+    def _standardize(accounts):
+        df = pd.DataFrame({'account': list(accounts), 'amount': [100 * (i + 1) for i in range(len(accounts))]})
+        return pipeline.standardize_account_names(df, 'account')
+    
+    return _standardize
+
+
+@pytest.fixture(scope="session")
+def processing_results_success():
+    return {
+        'dates': {'success': True, 'success_rate': 1.0},
+        'amounts': {'success': True, 'success_rate': 1.0},
+        'accounts': {'success': True}
+    }
+
+
+@pytest.fixture(scope="session")
+def processing_results_failure():
+    return {
+        'dates': {'success': False, 'error': 'Date error'},
+        'amounts': {'success': False, 'error': 'Amount error'}
+    }
+
+
+@pytest.fixture(scope="session")
+def column_mappings():
+    return {
+        'date': 'transaction_date',
+        'account': 'description',
+        'amount': 'amount_usd'
+    }
+
+
+@pytest.fixture(scope="session")
+def base_frames():
+    """Representative input frames, built once per test session.
+    
+    Tests that pass a frame to a function which may modify it take a copy.
+    """
+    return {
+        'valid_dates': pd.DataFrame({
+            'date': ['2023-01-15', '2023-02-20', '2023-03-10'],
+            'amount': [100, 200, 300]
+        }),
+        'clean_amounts': pd.DataFrame({
+            'amount': [100, 200, 300],
+            'date': ['2023-01-01', '2023-01-02', '2023-01-03']
+        }),
+        'messy_accounts': pd.DataFrame({
+            'account': ['  cash & bank  ', 'REVENUE INC', 'Expense Acct', 'bnk of america corp', 'office exp ltd'],
+            'amount': [100, 200, 300, 400, 500]
+        }),
+        'with_missing': pd.DataFrame({
+            'date': ['2023-01-01', None, '2023-01-03'],
+            'amount': [100, None, 300],
+            'account': ['Cash', None, 'Revenue'],
+            'balance': [1000, None, 1300]
+        }),
+        'no_missing': pd.DataFrame({
+            'date': ['2023-01-01', '2023-01-02', '2023-01-03'],
+            'amount': [100, 200, 300],
+            'account': ['Cash', 'Bank', 'Revenue']
+        }),
+        'with_duplicates': pd.DataFrame({
+            'date': ['2023-01-01', '2023-01-01', '2023-01-02', '2023-01-01'],
+            'amount': [100, 100, 200, 100],
+            'account': ['Cash', 'Cash', 'Bank', 'Cash']
+        }),
+        'no_duplicates': pd.DataFrame({
+            'date': ['2023-01-01', '2023-01-02', '2023-01-03'],
+            'amount': [100, 200, 300],
+            'account': ['Cash', 'Bank', 'Revenue']
+        }),
+        'good_quality': pd.DataFrame({
+            'date': ['2023-01-01', '2023-01-02', '2023-01-03'],
+            'amount': [100.0, 200.0, 300.0],
+            'account': ['Cash', 'Bank', 'Revenue']
+        }),
+        'poor_quality': pd.DataFrame({
+            'date': ['2023-01-01', None, 'invalid'],
+            'amount': [100.0, None, 'not_a_number'],
+            'account': ['Cash', None, '']
+        }),
+        'pipeline_input': pd.DataFrame({
+            'transaction_date': ['01/15/2023', '02/20/2023', '01/15/2023'],  # Mixed formats, duplicate
+            'description': ['  cash deposit  ', 'BANK FEE', '  cash deposit  '],
+            'amount_usd': ['$1,500.00', '($25.00)', '$1,500.00']
+        })
+    }
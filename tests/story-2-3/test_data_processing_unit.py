@@ -3,503 +3,411 @@ Unit Tests for Story 2.3: Data Processing Pipeline
 Tests all data cleaning and standardization functions with comprehensive coverage.
 """
 
-import unittest
+import pytest
 import pandas as pd
 import numpy as np
 from datetime import datetime
-import sys
-import os
-
-# Add the parent directory to the path so we can import from main.py
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
-from main import (
-    clean_and_standardize_dates,
-    clean_and_convert_amounts,
-    standardize_account_names,
-    handle_missing_values,
-    remove_duplicate_transactions,
-    generate_data_quality_summary,
-    process_data_pipeline
-)
-
-
-class TestCleanAndStandardizeDates(unittest.TestCase):
-    """Test the clean_and_standardize_dates function."""
-    
-    def setUp(self):
-        """Set up test data."""
-        self.df_valid = pd.DataFrame({
-            'date': ['2023-01-15', '2023-02-20', '2023-03-10'],
-            'amount': [100, 200, 300]
-        })
-        
-        self.df_mixed_formats = pd.DataFrame({
-            'date': ['01/15/2023', '2023-02-20', 'Mar 10, 2023', '15-04-2023'],
-            'amount': [100, 200, 300, 400]
-        })
-        
-        self.df_invalid_dates = pd.DataFrame({
-            'date': ['invalid', '2023-02-30', 'not a date', '2023-13-01'],
-            'amount': [100, 200, 300, 400]
-        })
-    
-    def test_clean_dates_valid_format(self):
-        """Test cleaning already valid date formats."""
-        result_df, result = clean_and_standardize_dates(self.df_valid, 'date')
-        
-        self.assertTrue(result['success'])
-        self.assertEqual(result['valid_dates'], 3)
-        self.assertEqual(result['invalid_dates'], 0)
-        self.assertEqual(result['success_rate'], 1.0)
-        
-        # Check date format is standardized
-        expected_dates = ['2023-01-15', '2023-02-20', '2023-03-10']
-        self.assertEqual(result_df['date'].tolist(), expected_dates)
-    
-    def test_clean_dates_mixed_formats(self):
-        """Test cleaning mixed date formats."""
-        result_df, result = clean_and_standardize_dates(self.df_mixed_formats, 'date')
-        
-        self.assertTrue(result['success'])
-        self.assertGreaterEqual(result['valid_dates'], 1)  # At least some dates should be valid
-        
-        # Valid dates should be converted to YYYY-MM-DD format
-        valid_dates = result_df['date'].dropna()
-        for date_str in valid_dates:
-            if date_str != 'NaT':
-                self.assertRegex(str(date_str), r'\d{4}-\d{2}-\d{2}')
-    
-    def test_clean_dates_invalid_formats(self):
-        """Test handling of invalid date formats."""
-        result_df, result = clean_and_standardize_dates(self.df_invalid_dates, 'date')
-        
-        self.assertTrue(result['success'])
-        self.assertLess(result['valid_dates'], 4)  # Some dates should be invalid
-        self.assertGreater(result['invalid_dates'], 0)
-        self.assertLess(result['success_rate'], 1.0)
-    
-    def test_clean_dates_nonexistent_column(self):
-        """Test handling of nonexistent date column."""
-        result_df, result = clean_and_standardize_dates(self.df_valid, 'nonexistent')
-        
-        self.assertFalse(result['success'])
-        self.assertIn('Date column not found', result['error'])
-    
-    def test_clean_dates_empty_dataframe(self):
-        """Test handling of empty DataFrame."""
-        empty_df = pd.DataFrame(columns=['date', 'amount'])
-        result_df, result = clean_and_standardize_dates(empty_df, 'date')
-        
-        self.assertTrue(result['success'])
-        self.assertEqual(result['valid_dates'], 0)
-        self.assertEqual(result['success_rate'], 0)
-
-
-class TestCleanAndConvertAmounts(unittest.TestCase):
-    """Test the clean_and_convert_amounts function."""
-    
-    def setUp(self):
-        """Set up test data."""
-        self.df_clean = pd.DataFrame({
-            'amount': [100, 200, 300],
-            'date': ['2023-01-01', '2023-01-02', '2023-01-03']
-        })
-        
-        self.df_currency_symbols = pd.DataFrame({
-            'amount': ['$100', '€200', '£300', '$1,500.50'],
-            'date': ['2023-01-01', '2023-01-02', '2023-01-03', '2023-01-04']
-        })
-        
-        self.df_negative_parentheses = pd.DataFrame({
-            'amount': ['(100)', '200', '(300.50)', '$1,000'],
-            'date': ['2023-01-01', '2023-01-02', '2023-01-03', '2023-01-04']
-        })
-        
-        self.df_invalid_amounts = pd.DataFrame({
-            'amount': ['not_a_number', 'abc', '$invalid', ''],
-            'date': ['2023-01-01', '2023-01-02', '2023-01-03', '2023-01-04']
-        })
-    
-    def test_clean_amounts_already_clean(self):
-        """Test cleaning already clean numeric amounts."""
-        result_df, result = clean_and_convert_amounts(self.df_clean, 'amount')
-        
-        self.assertTrue(result['success'])
-        self.assertEqual(result['valid_amounts'], 3)
-        self.assertEqual(result['invalid_amounts'], 0)
-        self.assertEqual(result['success_rate'], 1.0)
-        
+
+
+# Input frames come from the session-scoped base_frames fixture in conftest.py;
+# tests hand copies to the functions under test
+
+# --- clean_and_standardize_dates ---
+
+def test_clean_dates_valid_format(pipeline, base_frames):
+    """Test cleaning already valid date formats."""
+    result_df, result = pipeline.clean_and_standardize_dates(base_frames['valid_dates'].copy(), 'date')
+
+    assert result['success']
+    assert result['valid_dates'] == 3
+    assert result['invalid_dates'] == 0
+    assert result['success_rate'] == 1.0
+
+    # Check date format is standardized
+    expected_dates = ['2023-01-15', '2023-02-20', '2023-03-10']
+    np.testing.assert_array_equal(result_df['date'].to_numpy(dtype=object), np.asarray(expected_dates, dtype=object))
+
+
+def test_clean_dates_mixed_formats(pipeline):
+    """Test cleaning mixed date formats."""
+    df = pd.DataFrame({
+        'date': ['01/15/2023', '2023-02-20', 'Mar 10, 2023', '15-04-2023'],
+        'amount': [100, 200, 300, 400]
+    })
+    result_df, result = pipeline.clean_and_standardize_dates(df, 'date')
+
+    assert result['success']
+    assert result['valid_dates'] >= 1  # At least some dates should be valid
+
+    # Valid dates should be converted to YYYY-MM-DD format
+    valid_dates = result_df['date'].dropna().astype(str)
+    assert valid_dates[valid_dates != 'NaT'].str.match(r'\d{4}-\d{2}-\d{2}').all()
+
+
+def test_clean_dates_invalid_formats(pipeline):
+    """Test handling of invalid date formats."""
+    df = pd.DataFrame({
+        'date': ['invalid', '2023-02-30', 'not a date', '2023-13-01'],
+        'amount': [100, 200, 300, 400]
+    })
+    result_df, result = pipeline.clean_and_standardize_dates(df, 'date')
+
+    assert result['success']
+    assert result['valid_dates'] < 4  # Some dates should be invalid
+    assert result['invalid_dates'] > 0
+    assert result['success_rate'] < 1.0
+
+
+def test_clean_dates_nonexistent_column(pipeline, base_frames):
+    """Test handling of nonexistent date column."""
+    result_df, result = pipeline.clean_and_standardize_dates(base_frames['valid_dates'].copy(), 'nonexistent')
+
+    assert not result['success']
+    assert 'Date column not found' in result['error']
+
+
+def test_clean_dates_empty_dataframe(pipeline):
+    """Test handling of empty DataFrame."""
+    empty_df = pd.DataFrame(columns=['date', 'amount'])
+    result_df, result = pipeline.clean_and_standardize_dates(empty_df, 'date')
+
+    assert result['success']
+    assert result['valid_dates'] == 0
+    assert result['success_rate'] == 0
+
+
+# --- clean_and_convert_amounts ---
+
+_EXPECTED_CURRENCY = np.array([100.0, 200.0, 300.0, 1500.50])
+# (100) -> -100, 200 -> 200, (300.50) -> -300.50, $1,000 -> 1000
+_EXPECTED_NEG_PARENS = np.array([-100.0, 200.0, -300.50, 1000.0])
+
+
+# expected_invalid, expected_rate and expected_amounts are skipped when None
+@pytest.mark.parametrize("values,expected_valid,expected_invalid,expected_rate,expected_amounts", [
+    pytest.param([100, 200, 300], 3, 0, 1.0, None, id="already_clean"),
+    pytest.param(
+        ['$100', '€200', '£300', '$1,500.50'], 4, None, None, _EXPECTED_CURRENCY,
+        id="currency_symbols"
+    ),
+    pytest.param(
+        ['(100)', '200', '(300.50)', '$1,000'], 4, None, None, _EXPECTED_NEG_PARENS,
+        id="negative_parentheses"
+    ),
+    pytest.param(['not_a_number', 'abc', '$invalid', ''], 0, 4, 0.0, None, id="invalid_values"),
+])
+def test_clean_amounts(pipeline, values, expected_valid, expected_invalid, expected_rate, expected_amounts):
+    """Test cleaning clean, currency-formatted, accounting-negative and invalid amounts."""
+    df = pd.DataFrame({
+        'amount': values,
+        'date': pd.date_range('2023-01-01', periods=len(values), freq='D').strftime('%Y-%m-%d')
+    })
+    result_df, result = pipeline.clean_and_convert_amounts(df, 'amount')
+
+    assert result['success']
+    assert result['valid_amounts'] == expected_valid
+    if expected_invalid is not None:
+        assert result['invalid_amounts'] == expected_invalid
+    if expected_rate is not None:
+        assert result['success_rate'] == expected_rate
+
+    if expected_valid == len(values):
         # Check amounts are properly converted to numeric
-        self.assertTrue(pd.api.types.is_numeric_dtype(result_df['amount']))
-    
-    def test_clean_amounts_with_currency_symbols(self):
-        """Test cleaning amounts with currency symbols and commas."""
-        result_df, result = clean_and_convert_amounts(self.df_currency_symbols, 'amount')
-        
-        self.assertTrue(result['success'])
-        self.assertEqual(result['valid_amounts'], 4)
-        
-        # Check specific conversions
-        expected_amounts = [100.0, 200.0, 300.0, 1500.50]
-        self.assertEqual(result_df['amount'].tolist(), expected_amounts)
-    
-    def test_clean_amounts_negative_parentheses(self):
-        """Test handling of negative amounts in parentheses (accounting format)."""
-        result_df, result = clean_and_convert_amounts(self.df_negative_parentheses, 'amount')
-        
-        self.assertTrue(result['success'])
-        self.assertEqual(result['valid_amounts'], 4)
-        
-        # Check negative conversion
-        amounts = result_df['amount'].tolist()
-        self.assertEqual(amounts[0], -100.0)  # (100) -> -100
-        self.assertEqual(amounts[1], 200.0)   # 200 -> 200
-        self.assertEqual(amounts[2], -300.50) # (300.50) -> -300.50
-        self.assertEqual(amounts[3], 1000.0)  # $1,000 -> 1000
-    
-    def test_clean_amounts_invalid_values(self):
-        """Test handling of invalid amount values."""
-        result_df, result = clean_and_convert_amounts(self.df_invalid_amounts, 'amount')
-        
-        self.assertTrue(result['success'])
-        self.assertEqual(result['valid_amounts'], 0)
-        self.assertEqual(result['invalid_amounts'], 4)
-        self.assertEqual(result['success_rate'], 0.0)
-    
-    def test_clean_amounts_nonexistent_column(self):
-        """Test handling of nonexistent amount column."""
-        result_df, result = clean_and_convert_amounts(self.df_clean, 'nonexistent')
-        
-        self.assertFalse(result['success'])
-        self.assertIn('Amount column not found', result['error'])
-
-
-class TestStandardizeAccountNames(unittest.TestCase):
-    """Test the standardize_account_names function."""
-    
-    def setUp(self):
-        """Set up test data."""
-        self.df_messy_accounts = pd.DataFrame({
-            'account': ['  cash & bank  ', 'REVENUE INC', 'Expense Acct', 'bnk of america corp', 'office exp ltd'],
-            'amount': [100, 200, 300, 400, 500]
-        })
-        
-        self.df_standardizable = pd.DataFrame({
-            'account': ['Cash Bnk', 'Rev Income', 'Exp Office', 'Corp Account', 'Ltd Company'],
-            'amount': [100, 200, 300, 400, 500]
-        })
-    
-    def test_standardize_account_names_basic_cleaning(self):
-        """Test basic account name cleaning and standardization."""
-        result_df, result = standardize_account_names(self.df_messy_accounts, 'account')
-        
-        self.assertTrue(result['success'])
-        self.assertEqual(result['original_unique_accounts'], 5)
-        
-        # Check specific standardizations
-        accounts = result_df['account'].tolist()
-        self.assertEqual(accounts[0], 'Cash And Bank')  # trimmed, case fixed, & -> And
-        self.assertEqual(accounts[1], 'Revenue Income')  # case fixed, Inc -> Income
-        self.assertEqual(accounts[2], 'Expense Account')  # case fixed, Acct -> Account
-        self.assertEqual(accounts[3], 'Bank Of America Corporation')  # Bnk -> Bank, Corp -> Corporation
-        self.assertEqual(accounts[4], 'Office Expense Limited')  # Exp -> Expense, Ltd -> Limited
-    
-    def test_standardize_account_abbreviations(self):
-        """Test standardization of common abbreviations."""
-        result_df, result = standardize_account_names(self.df_standardizable, 'account')
-        
-        self.assertTrue(result['success'])
-        
-        accounts = result_df['account'].tolist()
-        self.assertIn('Bank', accounts[0])      # Bnk -> Bank
-        self.assertIn('Revenue', accounts[1])   # Rev -> Revenue
-        self.assertIn('Expense', accounts[2])   # Exp -> Expense
-        self.assertIn('Corporation', accounts[3]) # Corp -> Corporation
-        self.assertIn('Limited', accounts[4])   # Ltd -> Limited
-    
-    def test_standardize_account_nonexistent_column(self):
-        """Test handling of nonexistent account column."""
-        result_df, result = standardize_account_names(self.df_messy_accounts, 'nonexistent')
-        
-        self.assertFalse(result['success'])
-        self.assertIn('Account column not found', result['error'])
-    
-    def test_standardize_account_reduction_count(self):
-        """Test account name consolidation reduces unique count."""
-        # Create data with similar account names that should be standardized
-        df_similar = pd.DataFrame({
-            'account': ['Cash Bank', 'cash bnk', 'CASH BNK', '  Cash Bank  '],
-            'amount': [100, 200, 300, 400]
-        })
-        
-        result_df, result = standardize_account_names(df_similar, 'account')
-        
-        self.assertTrue(result['success'])
-        self.assertEqual(result['original_unique_accounts'], 4)
-        self.assertLessEqual(result['cleaned_unique_accounts'], 4)  # Should reduce or stay same
-
-
-class TestHandleMissingValues(unittest.TestCase):
-    """Test the handle_missing_values function."""
-    
-    def setUp(self):
-        """Set up test data."""
-        self.df_with_missing = pd.DataFrame({
-            'date': ['2023-01-01', None, '2023-01-03'],
-            'amount': [100, None, 300],
-            'account': ['Cash', None, 'Revenue'],
-            'balance': [1000, None, 1300]
-        })
-        
-        self.df_no_missing = pd.DataFrame({
-            'date': ['2023-01-01', '2023-01-02', '2023-01-03'],
-            'amount': [100, 200, 300],
-            'account': ['Cash', 'Bank', 'Revenue']
-        })
-    
-    def test_handle_missing_values_with_missing_data(self):
-        """Test handling missing values with appropriate strategies."""
-        result_df, result = handle_missing_values(self.df_with_missing)
-        
-        self.assertTrue(result['success'])
-        self.assertIn('missing_summary', result)
-        
-        # Check missing value handling strategies
-        # Date columns should remain NaN
-        self.assertTrue(pd.isna(result_df['date'].iloc[1]))
-        
-        # Amount/balance columns should be filled with 0
-        self.assertEqual(result_df['amount'].iloc[1], 0)
-        self.assertEqual(result_df['balance'].iloc[1], 0)
-        
-        # Other columns should be filled with 'Unknown'
-        self.assertEqual(result_df['account'].iloc[1], 'Unknown')
-    
-    def test_handle_missing_values_no_missing_data(self):
-        """Test handling when no missing values exist."""
-        result_df, result = handle_missing_values(self.df_no_missing)
-        
-        self.assertTrue(result['success'])
-        
-        # Check that all columns have 0% missing
-        for col_summary in result['missing_summary'].values():
-            self.assertEqual(col_summary['missing_count'], 0)
-            self.assertEqual(col_summary['missing_percentage'], 0.0)
-    
-    def test_handle_missing_values_summary_accuracy(self):
-        """Test accuracy of missing value summary statistics."""
-        result_df, result = handle_missing_values(self.df_with_missing)
-        
-        missing_summary = result['missing_summary']
-        
-        # Each column should have 1 missing value out of 3 total (33.33%)
-        for col in ['date', 'amount', 'account', 'balance']:
-            self.assertEqual(missing_summary[col]['missing_count'], 1)
-            self.assertAlmostEqual(missing_summary[col]['missing_percentage'], 33.33, places=1)
-
-
-class TestRemoveDuplicateTransactions(unittest.TestCase):
-    """Test the remove_duplicate_transactions function."""
-    
-    def setUp(self):
-        """Set up test data."""
-        self.df_with_duplicates = pd.DataFrame({
-            'date': ['2023-01-01', '2023-01-01', '2023-01-02', '2023-01-01'],
-            'amount': [100, 100, 200, 100],
-            'account': ['Cash', 'Cash', 'Bank', 'Cash']
-        })
-        
-        self.df_no_duplicates = pd.DataFrame({
-            'date': ['2023-01-01', '2023-01-02', '2023-01-03'],
-            'amount': [100, 200, 300],
-            'account': ['Cash', 'Bank', 'Revenue']
-        })
-    
-    def test_remove_duplicates_with_duplicates(self):
-        """Test removing duplicate transactions."""
-        result_df, result = remove_duplicate_transactions(self.df_with_duplicates)
-        
-        self.assertTrue(result['success'])
-        self.assertEqual(result['original_count'], 4)
-        self.assertEqual(result['final_count'], 2)  # Should have 2 unique rows
-        self.assertEqual(result['duplicates_removed'], 2)
-        
-        # Check that duplicates are actually removed
-        self.assertEqual(len(result_df), 2)
-        self.assertEqual(len(result_df.drop_duplicates()), len(result_df))
-    
-    def test_remove_duplicates_no_duplicates(self):
-        """Test when no duplicates exist."""
-        result_df, result = remove_duplicate_transactions(self.df_no_duplicates)
-        
-        self.assertTrue(result['success'])
-        self.assertEqual(result['original_count'], 3)
-        self.assertEqual(result['final_count'], 3)
-        self.assertEqual(result['duplicates_removed'], 0)
-
-
-class TestGenerateDataQualitySummary(unittest.TestCase):
-    """Test the generate_data_quality_summary function."""
-    
-    def setUp(self):
-        """Set up test data."""
-        self.df_good_quality = pd.DataFrame({
-            'date': ['2023-01-01', '2023-01-02', '2023-01-03'],
-            'amount': [100.0, 200.0, 300.0],
-            'account': ['Cash', 'Bank', 'Revenue']
-        })
-        
-        self.df_poor_quality = pd.DataFrame({
-            'date': ['2023-01-01', None, 'invalid'],
-            'amount': [100.0, None, 'not_a_number'],
-            'account': ['Cash', None, '']
-        })
-        
-        self.processing_results_success = {
-            'dates': {'success': True, 'success_rate': 1.0},
-            'amounts': {'success': True, 'success_rate': 1.0},
-            'accounts': {'success': True}
-        }
-        
-        self.processing_results_failure = {
-            'dates': {'success': False, 'error': 'Date error'},
-            'amounts': {'success': False, 'error': 'Amount error'}
-        }
-    
-    def test_generate_quality_summary_good_data(self):
-        """Test quality summary generation for good quality data."""
-        summary = generate_data_quality_summary(self.df_good_quality, self.processing_results_success)
-        
-        self.assertNotIn('error', summary)
-        self.assertEqual(summary['total_rows'], 3)
-        self.assertEqual(summary['total_columns'], 3)
-        self.assertGreaterEqual(summary['data_quality_score'], 70)  # Should be reasonably high quality
-        
-        # Check column info is generated
-        self.assertIn('column_info', summary)
-        for col in ['date', 'amount', 'account']:
-            self.assertIn(col, summary['column_info'])
-            col_info = summary['column_info'][col]
-            self.assertEqual(col_info['completeness_rate'], 100.0)  # All data present
-    
-    def test_generate_quality_summary_poor_data(self):
-        """Test quality summary generation for poor quality data."""
-        summary = generate_data_quality_summary(self.df_poor_quality, self.processing_results_failure)
-        
-        self.assertNotIn('error', summary)
-        self.assertEqual(summary['total_rows'], 3)
-        self.assertLess(summary['data_quality_score'], 70)  # Should be low quality
-        
-        # Should have recommendations for improvement
-        self.assertGreater(len(summary['recommendations']), 0)
-    
-    def test_generate_quality_summary_column_analysis(self):
-        """Test detailed column analysis in quality summary."""
-        summary = generate_data_quality_summary(self.df_good_quality, self.processing_results_success)
-        
-        # Check date column analysis
-        date_info = summary['column_info']['date']
-        self.assertIn('date_range', date_info)
-        self.assertIsNotNone(date_info['date_range']['earliest'])
-        self.assertIsNotNone(date_info['date_range']['latest'])
-        
-        # Check amount column analysis
-        amount_info = summary['column_info']['amount']
-        self.assertIn('statistics', amount_info)
-        self.assertEqual(amount_info['statistics']['min'], 100.0)
-        self.assertEqual(amount_info['statistics']['max'], 300.0)
-        
-        # Check account column analysis
-        account_info = summary['column_info']['account']
-        self.assertEqual(account_info['unique_values'], 3)
-
-
-class TestProcessDataPipeline(unittest.TestCase):
-    """Test the main process_data_pipeline function."""
-    
-    def setUp(self):
-        """Set up test data."""
-        self.df_test = pd.DataFrame({
-            'transaction_date': ['01/15/2023', '02/20/2023', '01/15/2023'],  # Mixed formats, duplicate
-            'description': ['  cash deposit  ', 'BANK FEE', '  cash deposit  '],
-            'amount_usd': ['$1,500.00', '($25.00)', '$1,500.00']
-        })
-        
-        self.column_mappings = {
-            'date': 'transaction_date',
-            'account': 'description',
-            'amount': 'amount_usd'
-        }
-    
-    def test_process_data_pipeline_full_integration(self):
-        """Test the complete data processing pipeline."""
-        processed_df, processing_results, quality_summary = process_data_pipeline(
-            self.df_test, self.column_mappings
-        )
-        
-        # Check that all processing steps completed
-        expected_steps = ['missing_values', 'duplicates', 'dates', 'amounts', 'accounts']
-        for step in expected_steps:
-            self.assertIn(step, processing_results)
-            if processing_results[step] is not None:
-                self.assertTrue(processing_results[step]['success'])
-        
-        # Check processed data quality
-        self.assertIsInstance(processed_df, pd.DataFrame)
-        self.assertGreater(len(processed_df), 0)
-        
-        # Check quality summary generation
-        self.assertIsInstance(quality_summary, dict)
-        self.assertIn('data_quality_score', quality_summary)
-        
-        # Verify data transformations
-        # Dates should be standardized
-        if not processed_df['transaction_date'].isna().all():
-            for date_val in processed_df['transaction_date'].dropna():
-                self.assertRegex(str(date_val), r'\d{4}-\d{2}-\d{2}')
-        
-        # Amounts should be numeric
-        self.assertTrue(pd.api.types.is_numeric_dtype(processed_df['amount_usd']))
-        
-        # Duplicates should be removed
-        self.assertLessEqual(len(processed_df), len(self.df_test))
-    
-    def test_process_data_pipeline_missing_mappings(self):
-        """Test pipeline behavior with missing column mappings."""
-        incomplete_mappings = {
-            'date': 'transaction_date',
-            'account': None,  # Missing account mapping
-            'amount': 'amount_usd'
-        }
-        
-        processed_df, processing_results, quality_summary = process_data_pipeline(
-            self.df_test, incomplete_mappings
-        )
-        
-        # Should still process successfully with available mappings
-        self.assertIn('missing_values', processing_results)
-        self.assertIn('duplicates', processing_results)
-        self.assertIn('dates', processing_results)
-        self.assertIn('amounts', processing_results)
-        # Account processing should be skipped
-        self.assertNotIn('accounts', processing_results)
-    
-    def test_process_data_pipeline_empty_dataframe(self):
-        """Test pipeline with empty DataFrame."""
-        empty_df = pd.DataFrame(columns=['date', 'account', 'amount'])
-        empty_mappings = {'date': 'date', 'account': 'account', 'amount': 'amount'}
-        
-        processed_df, processing_results, quality_summary = process_data_pipeline(
-            empty_df, empty_mappings
-        )
-        
-        # Should handle empty data gracefully
-        self.assertIsInstance(processed_df, pd.DataFrame)
-        self.assertIsInstance(processing_results, dict)
-        self.assertIsInstance(quality_summary, dict)
+        assert pd.api.types.is_numeric_dtype(result_df['amount'])
+    if expected_amounts is not None:
+        np.testing.assert_array_equal(result_df['amount'].to_numpy(), expected_amounts)
+
+
+def test_clean_amounts_nonexistent_column(pipeline, base_frames):
+    """Test handling of nonexistent amount column."""
+    result_df, result = pipeline.clean_and_convert_amounts(base_frames['clean_amounts'].copy(), 'nonexistent')
+
+    assert not result['success']
+    assert 'Amount column not found' in result['error']
+
+
+# --- standardize_account_names ---
+
+# Similar account names that should be standardized; a tuple so it can key the cache
+_SIMILAR_ACCOUNTS = ('Cash Bank', 'cash bnk', 'CASH BNK', '  Cash Bank  ')
+
+
+# With exact=True each cleaned name must equal its expectation; otherwise it
+# must contain the expected term
+@pytest.mark.parametrize("values,expected,exact", [
+    pytest.param(
+        ['  cash & bank  ', 'REVENUE INC', 'Expense Acct', 'bnk of america corp', 'office exp ltd'],
+        [
+            'Cash And Bank',  # trimmed, case fixed, & -> And
+            'Revenue Income',  # case fixed, Inc -> Income
+            'Expense Account',  # case fixed, Acct -> Account
+            'Bank Of America Corporation',  # Bnk -> Bank, Corp -> Corporation
+            'Office Expense Limited'  # Exp -> Expense, Ltd -> Limited
+        ],
+        True,
+        id="basic_cleaning"
+    ),
+    pytest.param(
+        ['Cash Bnk', 'Rev Income', 'Exp Office', 'Corp Account', 'Ltd Company'],
+        ['Bank', 'Revenue', 'Expense', 'Corporation', 'Limited'],
+        False,
+        id="abbreviations"
+    ),
+])
+def test_standardize_account_names(standardize_accounts, values, expected, exact):
+    """Test account name cleaning and standardization of common abbreviations."""
+    result_df, result = standardize_accounts(tuple(values))
+
+    assert result['success']
+
+    accounts = result_df['account'].to_numpy(dtype=str)
+    if exact:
+        assert result['original_unique_accounts'] == len(set(values))
+        np.testing.assert_array_equal(accounts.astype(object), np.asarray(expected, dtype=object))
+    else:
+        assert (np.char.find(accounts, expected) >= 0).all()
+
+
+def test_standardize_account_nonexistent_column(pipeline, base_frames):
+    """Test handling of nonexistent account column."""
+    result_df, result = pipeline.standardize_account_names(base_frames['messy_accounts'].copy(), 'nonexistent')
+
+    assert not result['success']
+    assert 'Account column not found' in result['error']
+
+
+def test_standardize_account_reduction_count(standardize_accounts):
+    """Test account name consolidation reduces unique count."""
+    result_df, result = standardize_accounts(_SIMILAR_ACCOUNTS)
+
+    assert result['success']
+    assert result['original_unique_accounts'] == 4
+    assert result['cleaned_unique_accounts'] <= 4  # Should reduce or stay same
+
+
+# --- handle_missing_values ---
+
+def test_handle_missing_values_with_missing_data(pipeline, base_frames):
+    """Test handling missing values with appropriate strategies."""
+    result_df, result = pipeline.handle_missing_values(base_frames['with_missing'].copy())
+
+    assert result['success']
+    assert 'missing_summary' in result
+
+    # Check missing value handling strategies
+    # Date columns should remain NaN
+    assert pd.isna(result_df['date'].iloc[1])
+
+    # Amount/balance columns should be filled with 0
+    assert result_df['amount'].iloc[1] == 0
+    assert result_df['balance'].iloc[1] == 0
+
+    # Other columns should be filled with 'Unknown'
+    assert result_df['account'].iloc[1] == 'Unknown'
+
+
+def test_handle_missing_values_no_missing_data(pipeline, base_frames):
+    """Test handling when no missing values exist."""
+    result_df, result = pipeline.handle_missing_values(base_frames['no_missing'].copy())
+
+    assert result['success']
+
+    # Check that all columns have 0% missing
+    for col_summary in result['missing_summary'].values():
+        assert col_summary['missing_count'] == 0
+        assert col_summary['missing_percentage'] == 0.0
+
+
+def test_handle_missing_values_summary_accuracy(pipeline, base_frames):
+    """Test accuracy of missing value summary statistics."""
+    result_df, result = pipeline.handle_missing_values(base_frames['with_missing'].copy())
+
+    missing_summary = result['missing_summary']
+
+    # Each column should have 1 missing value out of 3 total (33.33%)
+    cols = ['date', 'amount', 'account', 'balance']
+    fields = ['missing_count', 'missing_percentage']
+    expected = pd.DataFrame({'missing_count': 1.0, 'missing_percentage': 33.33}, index=cols)
+    actual = pd.DataFrame(missing_summary).T.loc[cols, fields].astype(float)
+    pd.testing.assert_frame_equal(actual, expected, check_exact=False, rtol=0, atol=0.05)
+
+
+# --- remove_duplicate_transactions ---
+
+def test_remove_duplicates_with_duplicates(pipeline, base_frames):
+    """Test removing duplicate transactions."""
+    result_df, result = pipeline.remove_duplicate_transactions(base_frames['with_duplicates'].copy())
+
+    assert result['success']
+    assert result['original_count'] == 4
+    assert result['final_count'] == 2  # Should have 2 unique rows
+    assert result['duplicates_removed'] == 2
+
+    # Check that duplicates are actually removed
+    assert len(result_df) == 2
+    assert len(result_df.drop_duplicates()) == len(result_df)
+
+
+def test_remove_duplicates_no_duplicates(pipeline, base_frames):
+    """Test when no duplicates exist."""
+    result_df, result = pipeline.remove_duplicate_transactions(base_frames['no_duplicates'].copy())
+
+    assert result['success']
+    assert result['original_count'] == 3
+    assert result['final_count'] == 3
+    assert result['duplicates_removed'] == 0
+
+
+# --- generate_data_quality_summary ---
+
+def test_generate_quality_summary_good_data(pipeline, base_frames, processing_results_success):
+    """Test quality summary generation for good quality data."""
+    summary = pipeline.generate_data_quality_summary(base_frames['good_quality'].copy(), processing_results_success)
+
+    assert 'error' not in summary
+    assert summary['total_rows'] == 3
+    assert summary['total_columns'] == 3
+    assert summary['data_quality_score'] >= 70  # Should be reasonably high quality
+
+    # Check column info is generated
+    assert 'column_info' in summary
+    for col in ['date', 'amount', 'account']:
+        assert col in summary['column_info']
+        col_info = summary['column_info'][col]
+        assert col_info['completeness_rate'] == 100.0  # All data present
+
+
+def test_generate_quality_summary_poor_data(pipeline, base_frames, processing_results_failure):
+    """Test quality summary generation for poor quality data."""
+    summary = pipeline.generate_data_quality_summary(base_frames['poor_quality'].copy(), processing_results_failure)
+
+    assert 'error' not in summary
+    assert summary['total_rows'] == 3
+    assert summary['data_quality_score'] < 70  # Should be low quality
+
+    # Should have recommendations for improvement
+    assert len(summary['recommendations']) > 0
+
+
+def test_generate_quality_summary_column_analysis(pipeline, base_frames, processing_results_success):
+    """Test detailed column analysis in quality summary."""
+    summary = pipeline.generate_data_quality_summary(base_frames['good_quality'].copy(), processing_results_success)
+
+    # Check date column analysis
+    date_info = summary['column_info']['date']
+    assert 'date_range' in date_info
+    assert date_info['date_range']['earliest'] is not None
+    assert date_info['date_range']['latest'] is not None
+
+    # Check amount column analysis
+    amount_info = summary['column_info']['amount']
+    assert 'statistics' in amount_info
+    assert amount_info['statistics']['min'] == 100.0
+    assert amount_info['statistics']['max'] == 300.0
+
+    # Check account column analysis
+    account_info = summary['column_info']['account']
+    assert account_info['unique_values'] == 3
+
+
+# --- process_data_pipeline ---
+
+@pytest.fixture(scope="module")
+def pipeline_result(pipeline, base_frames, column_mappings):
+    """Run the complete pipeline once and share its output across assertions."""
+    return pipeline.process_data_pipeline(base_frames['pipeline_input'].copy(), column_mappings)
+
+
+def test_process_data_pipeline_steps_completed(pipeline_result):
+    """Test that all processing steps completed."""
+    _, processing_results, _ = pipeline_result
+
+    expected_steps = ['missing_values', 'duplicates', 'dates', 'amounts', 'accounts']
+    for step in expected_steps:
+        assert step in processing_results
+        if processing_results[step] is not None:
+            assert processing_results[step]['success']
+
+
+def test_process_data_pipeline_output_frame(pipeline_result):
+    """Test processed data quality."""
+    processed_df, _, _ = pipeline_result
+
+    assert isinstance(processed_df, pd.DataFrame)
+    assert len(processed_df) > 0
+
+
+def test_process_data_pipeline_quality_summary(pipeline_result):
+    """Test quality summary generation."""
+    _, _, quality_summary = pipeline_result
+
+    assert isinstance(quality_summary, dict)
+    assert 'data_quality_score' in quality_summary
+
+
+def test_process_data_pipeline_dates_standardized(pipeline_result):
+    """Test that dates are standardized."""
+    processed_df, _, _ = pipeline_result
+
+    if not processed_df['transaction_date'].isna().all():
+        dates = processed_df['transaction_date'].dropna().astype(str)
+        assert dates.str.fullmatch(r'\d{4}-\d{2}-\d{2}').all()
+
+
+def test_process_data_pipeline_amounts_numeric(pipeline_result):
+    """Test that amounts are numeric."""
+    processed_df, _, _ = pipeline_result
+
+    assert pd.api.types.is_numeric_dtype(processed_df['amount_usd'])
+
+
+def test_process_data_pipeline_duplicates_removed(pipeline_result, base_frames):
+    """Test that duplicates are removed."""
+    processed_df, _, _ = pipeline_result
+
+    assert len(processed_df) <= len(base_frames['pipeline_input'])
+
+
+def test_process_data_pipeline_missing_mappings(pipeline, base_frames):
+    """Test pipeline behavior with missing column mappings."""
+    incomplete_mappings = {
+        'date': 'transaction_date',
+        'account': None,  # Missing account mapping
+        'amount': 'amount_usd'
+    }
+
+    processed_df, processing_results, quality_summary = pipeline.process_data_pipeline(
+        base_frames['pipeline_input'].copy(), incomplete_mappings
+    )
+
+    # Should still process successfully with available mappings
+    assert 'missing_values' in processing_results
+    assert 'duplicates' in processing_results
+    assert 'dates' in processing_results
+    assert 'amounts' in processing_results
+    # Account processing should be skipped
+    assert 'accounts' not in processing_results
+
+
+@pytest.mark.parametrize("rows", [
+    None,
+    {'date': ['2023-01-01'], 'account': ['Cash'], 'amount': [100.0]},
+], ids=['empty', 'tiny'])
+def test_process_data_pipeline_minimal_dataframe(pipeline, rows):
+    """Test pipeline with empty and single-row DataFrames."""
+    minimal_df = pd.DataFrame(rows, columns=['date', 'account', 'amount'])
+    minimal_mappings = {'date': 'date', 'account': 'account', 'amount': 'amount'}
+
+    processed_df, processing_results, quality_summary = pipeline.process_data_pipeline(
+        minimal_df, minimal_mappings
+    )
+
+    # Should handle empty and near-empty data gracefully
+    assert isinstance(processed_df, pd.DataFrame)
+    assert isinstance(processing_results, dict)
+    assert isinstance(quality_summary, dict)
 
 
 if __name__ == '__main__':
     # Run all tests
-    unittest.main(verbosity=2)
\ No newline at end of file
+    pytest.main(['-q', __file__])
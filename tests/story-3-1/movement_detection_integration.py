@@ -10,7 +10,9 @@ This integration test verifies:
 5. Real-world data scenarios and edge cases
 """
 
+import importlib.util
 import unittest
+import pytest
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -28,122 +30,135 @@ from main import (
 )
 
 
-class TestMovementDetectionIntegration(unittest.TestCase):
+def _month_ends(start, periods):
+    """Consecutive month-end dates as datetime64, so fixtures skip string parsing."""
+    return pd.date_range(start, periods=periods, freq=pd.offsets.MonthEnd())
+
+
+def _frame_from_columns(*parts):
+    """Build one fixture frame from several Date/Account/Amount column dicts."""
+    return pd.DataFrame({
+        col: np.concatenate([part[col] for part in parts])
+        for col in ('Date', 'Account', 'Amount')
+    })
+
+
+def _as_uploaded(frame):
+    """Fresh copy of a fixture with the string/int64 columns a parsed CSV upload has."""
+    return pd.DataFrame({
+        'Date': pd.to_datetime(frame['Date']).dt.strftime('%Y-%m-%d').astype(object),
+        'Account': frame['Account'].astype(str).astype(object),
+        'Amount': frame['Amount'].astype(np.int64)
+    })
+
+
+class EngineResultsCacheMixin:
+    """Runs the movement detection engine at most once per class fixture."""
+    
+    @classmethod
+    def get_results(cls, key):
+        """Return engine results for the named class fixture, computing them on first use."""
+        if key not in cls._results_cache:
+            # The engine gets a private copy so the shared fixture is never mutated
+            cls._results_cache[key] = run_movement_detection_engine(getattr(cls, key).copy())
+        return cls._results_cache[key]
+
+
+class TestMovementDetectionIntegration(EngineResultsCacheMixin, unittest.TestCase):
     """Integration tests for movement detection engine with realistic data scenarios."""
     
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """Set up realistic financial data scenarios for integration testing."""
         
         # Scenario 1: Real P&L data with significant movements
-        self.pnl_data = pd.DataFrame({
-            'Date': [
-                '2023-01-31', '2023-02-28', '2023-03-31', '2023-04-30', '2023-05-31', '2023-06-30',
-                '2023-07-31', '2023-08-31', '2023-09-30', '2023-10-31', '2023-11-30', '2023-12-31',
-                '2024-01-31', '2024-02-29', '2024-03-31', '2024-04-30', '2024-05-31', '2024-06-30'
-            ],
-            'Account': [
-                'Sales Revenue', 'Sales Revenue', 'Sales Revenue', 'Sales Revenue', 'Sales Revenue', 'Sales Revenue',
-                'Sales Revenue', 'Sales Revenue', 'Sales Revenue', 'Sales Revenue', 'Sales Revenue', 'Sales Revenue',
-                'Sales Revenue', 'Sales Revenue', 'Sales Revenue', 'Sales Revenue', 'Sales Revenue', 'Sales Revenue'
-            ],
-            'Amount': [
+        revenue = {
+            'Date': _month_ends('2023-01-31', 18),  # Jan 2023 - Jun 2024
+            'Account': np.repeat('Sales Revenue', 18),
+            'Amount': np.array([
                 500000, 520000, 580000, 600000, 650000, 700000,
                 750000, 780000, 820000, 850000, 900000, 950000,
                 550000, 620000, 680000, 720000, 800000, 850000  # YoY increases
-            ]
-        })
+            ])
+        }
         
         # Add expense data with significant movements
-        expense_data = pd.DataFrame({
-            'Date': [
-                '2023-01-31', '2023-02-28', '2023-03-31', '2023-04-30', '2023-05-31', '2023-06-30',
-                '2023-07-31', '2023-08-31', '2023-09-30', '2023-10-31', '2023-11-30', '2023-12-31',
-                '2024-01-31', '2024-02-29', '2024-03-31', '2024-04-30', '2024-05-31', '2024-06-30'
-            ],
-            'Account': [
-                'Marketing Expense', 'Marketing Expense', 'Marketing Expense', 'Marketing Expense', 'Marketing Expense', 'Marketing Expense',
-                'Marketing Expense', 'Marketing Expense', 'Marketing Expense', 'Marketing Expense', 'Marketing Expense', 'Marketing Expense',
-                'Marketing Expense', 'Marketing Expense', 'Marketing Expense', 'Marketing Expense', 'Marketing Expense', 'Marketing Expense'
-            ],
-            'Amount': [
+        expense = {
+            'Date': _month_ends('2023-01-31', 18),  # Jan 2023 - Jun 2024
+            'Account': np.repeat('Marketing Expense', 18),
+            'Amount': np.array([
                 -50000, -52000, -48000, -55000, -60000, -65000,
                 -70000, -75000, -80000, -120000, -130000, -140000,  # Big jump in Oct-Dec
                 -60000, -65000, -58000, -70000, -80000, -90000  # Higher than prior year
-            ]
-        })
-        
-        # Combine revenue and expense data
-        self.pnl_data = pd.concat([self.pnl_data, expense_data], ignore_index=True)
+            ])
+        }
         
         # Scenario 2: Financial statement with new accounts
-        self.new_account_data = pd.DataFrame({
-            'Date': [
-                '2023-10-31', '2023-11-30', '2023-12-31',  # New account starting Oct 2023
-                '2024-01-31', '2024-02-29', '2024-03-31'
-            ],
-            'Account': [
-                'New Product Line', 'New Product Line', 'New Product Line',
-                'New Product Line', 'New Product Line', 'New Product Line'
-            ],
-            'Amount': [
+        new_account = {
+            'Date': _month_ends('2023-10-31', 6),  # New account starting Oct 2023
+            'Account': np.repeat('New Product Line', 6),
+            'Amount': np.array([
                 25000, 30000, 35000, 40000, 45000, 50000
-            ]
-        })
+            ])
+        }
         
         # Scenario 3: Discontinued account data
-        self.discontinued_data = pd.DataFrame({
-            'Date': [
-                '2023-01-31', '2023-02-28', '2023-03-31', '2023-04-30',  # Account active until Apr
-                '2024-01-31', '2024-02-29', '2024-03-31', '2024-04-30'   # Different account same periods
-            ],
-            'Account': [
-                'Old Product Line', 'Old Product Line', 'Old Product Line', 'Old Product Line',
-                'Continuing Product', 'Continuing Product', 'Continuing Product', 'Continuing Product'
-            ],
-            'Amount': [
+        discontinued = {
+            'Date': _month_ends('2023-01-31', 4).append(  # Account active until Apr
+                _month_ends('2024-01-31', 4)              # Different account same periods
+            ),
+            'Account': np.repeat(['Old Product Line', 'Continuing Product'], 4),
+            'Amount': np.array([
                 15000, 18000, 20000, 22000,
                 25000, 28000, 30000, 32000
-            ]
-        })
+            ])
+        }
+        
+        # Assemble each fixture straight from its columns rather than via pd.concat
+        cls.pnl_data = _frame_from_columns(revenue, expense)
+        cls.new_account_data = pd.DataFrame(new_account)
+        cls.discontinued_data = pd.DataFrame(discontinued)
         
         # Combine all scenarios for comprehensive test
-        self.comprehensive_data = pd.concat([
-            self.pnl_data, 
-            self.new_account_data, 
-            self.discontinued_data
-        ], ignore_index=True)
+        cls.comprehensive_data = _frame_from_columns(revenue, expense, new_account, discontinued)
         
         # Scenario 4: Edge case data (zeros, negatives, extreme values)
-        self.edge_case_data = pd.DataFrame({
-            'Date': [
-                '2023-01-31', '2023-02-28', '2023-03-31',
-                '2023-01-31', '2023-02-28', '2023-03-31',
-                '2023-01-31', '2023-02-28', '2023-03-31'
-            ],
-            'Account': [
-                'Zero Account', 'Zero Account', 'Zero Account',
-                'Extreme Growth', 'Extreme Growth', 'Extreme Growth',
-                'Volatile Account', 'Volatile Account', 'Volatile Account'
-            ],
+        cls.edge_case_data = pd.DataFrame({
+            'Date': np.tile(_month_ends('2023-01-31', 3), 3),
+            'Account': np.repeat(['Zero Account', 'Extreme Growth', 'Volatile Account'], 3),
             'Amount': [
                 0, 0, 1000,  # Goes from 0 to 1000 (should handle division by zero)
                 1000, 50000, 100000,  # Extreme growth
                 10000, -5000, 15000  # Volatile swings
             ]
         })
+        
+        # Categorical accounts let the engine group on integer codes, and the
+        # whole-unit amounts fit losslessly in int32
+        for name in ('pnl_data', 'new_account_data', 'discontinued_data',
+                     'comprehensive_data', 'edge_case_data'):
+            frame = getattr(cls, name)
+            frame['Account'] = frame['Account'].astype('category')
+            frame['Amount'] = frame['Amount'].astype(np.int32)
+        
+        # Engine results per fixture, filled lazily by get_results
+        cls._results_cache = {}
     
     def test_complete_movement_detection_workflow(self):
         """Test the complete movement detection workflow from raw data to insights."""
         
         # Step 1: Validate that data processing pipeline integration works
-        column_mappings = detect_column_mappings(self.comprehensive_data)
+        # Upload-shaped copy, so the pipeline's coercion paths run and the
+        # shared typed fixture is never mutated
+        upload_df = _as_uploaded(self.comprehensive_data)
+        column_mappings = detect_column_mappings(upload_df)
         self.assertIsNotNone(column_mappings['date'])
         self.assertIsNotNone(column_mappings['account'])
         self.assertIsNotNone(column_mappings['amount'])
         
         # Step 2: Process data through the pipeline (simulating Epic 2 completion)
         processed_df, processing_results, quality_summary = process_data_pipeline(
-            self.comprehensive_data, column_mappings
+            upload_df, column_mappings
         )
         
         self.assertIsNotNone(processed_df)
@@ -213,9 +228,8 @@ class TestMovementDetectionIntegration(unittest.TestCase):
         self.assertGreater(len(yoy_movements), 0)
         
         # Verify percentage calculations
-        for _, movement in yoy_movements.iterrows():
-            self.assertEqual(movement['movement_type'], 'YoY')
-            self.assertGreater(abs(movement['percentage_change']), 15)  # Should exceed YoY threshold
+        self.assertTrue((yoy_movements['movement_type'] == 'YoY').all())
+        self.assertTrue((yoy_movements['percentage_change'].abs() > 15).all())  # Should exceed YoY threshold
         
         # Check that significant movements were flagged
         significant_movements = movement_results['significant_movements']
@@ -261,7 +275,7 @@ class TestMovementDetectionIntegration(unittest.TestCase):
     def test_edge_cases_handling(self):
         """Test handling of edge cases like zero values, extreme changes, etc."""
         
-        movement_results = run_movement_detection_engine(self.edge_case_data)
+        movement_results = self.get_results('edge_case_data')
         
         # Should handle edge cases gracefully
         self.assertTrue(movement_results['success'])
@@ -277,7 +291,7 @@ class TestMovementDetectionIntegration(unittest.TestCase):
     def test_materiality_ranking_integration(self):
         """Test that materiality ranking works correctly in the integrated system."""
         
-        movement_results = run_movement_detection_engine(self.comprehensive_data)
+        movement_results = self.get_results('comprehensive_data')
         
         self.assertTrue(movement_results['success'])
         
@@ -302,7 +316,7 @@ class TestMovementDetectionIntegration(unittest.TestCase):
     def test_session_state_data_structure(self):
         """Test that movement detection results are properly structured for session state storage."""
         
-        movement_results = run_movement_detection_engine(self.comprehensive_data)
+        movement_results = self.get_results('comprehensive_data')
         
         # Verify all required keys are present for UI integration
         required_keys = [
@@ -328,18 +342,14 @@ class TestMovementDetectionIntegration(unittest.TestCase):
         dates = pd.date_range(start='2023-01-01', end='2024-12-31', freq='D')
         accounts = [f'Account_{i:02d}' for i in range(1, 21)]
         
-        large_data = []
-        for account in accounts:
-            for date in dates:
-                # Generate realistic amounts with some variation
-                base_amount = np.random.normal(10000, 2000)
-                large_data.append({
-                    'Date': date.strftime('%Y-%m-%d'),
-                    'Account': account,
-                    'Amount': max(0, base_amount)  # Ensure positive amounts
-                })
-        
-        large_df = pd.DataFrame(large_data)
+        # Generate realistic amounts with some variation, one row per account per day
+        n_dates, n_accounts = len(dates), len(accounts)
+        amounts = np.clip(np.random.normal(10000, 2000, n_accounts * n_dates), 0, None)  # Ensure positive amounts
+        large_df = pd.DataFrame({
+            'Date': np.tile(dates.strftime('%Y-%m-%d').to_numpy(), n_accounts),
+            'Account': np.repeat(np.asarray(accounts), n_dates),
+            'Amount': amounts
+        })
         
         # Should handle large datasets without errors
         movement_results = run_movement_detection_engine(large_df)
@@ -389,54 +399,58 @@ class TestMovementDetectionIntegration(unittest.TestCase):
                 self.assertTrue(movement_results['success'], f"Failed on test case {i}")
 
 
-class TestMovementDetectionManualE2E(unittest.TestCase):
+class TestMovementDetectionManualE2E(EngineResultsCacheMixin, unittest.TestCase):
     """Manual E2E test scenarios as specified in the story requirements."""
     
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """Set up data for manual E2E test scenarios."""
         
         # Multiple months dataset
-        self.multi_month_data = pd.DataFrame({
-            'Date': [
-                '2023-01-31', '2023-02-28', '2023-03-31', '2023-04-30',
-                '2023-05-31', '2023-06-30', '2023-07-31', '2023-08-31'
-            ],
+        cls.multi_month_data = pd.DataFrame({
+            'Date': _month_ends('2023-01-31', 8),
             'Account': ['Sales'] * 8,
             'Amount': [100000, 85000, 120000, 95000, 110000, 140000, 130000, 160000]
         })
         
         # Multi-year dataset
-        self.multi_year_data = pd.DataFrame({
-            'Date': [
-                '2022-01-31', '2022-02-28', '2022-03-31',
-                '2023-01-31', '2023-02-28', '2023-03-31',
-                '2024-01-31', '2024-02-29', '2024-03-31'
-            ],
+        cls.multi_year_data = pd.DataFrame({
+            'Date': _month_ends('2022-01-31', 3).append(
+                [_month_ends('2023-01-31', 3), _month_ends('2024-01-31', 3)]
+            ),
             'Account': ['Revenue'] * 9,
             'Amount': [100000, 110000, 120000, 120000, 140000, 150000, 150000, 180000, 200000]
         })
         
         # Dataset with new accounts
-        self.new_account_data = pd.DataFrame({
-            'Date': [
-                '2023-10-31', '2023-11-30', '2023-12-31',
-                '2024-01-31', '2024-02-29', '2024-03-31'
-            ],
+        cls.new_account_data = pd.DataFrame({
+            'Date': _month_ends('2023-10-31', 6),
             'Account': ['Existing Product'] * 3 + ['New Product Launch'] * 3,
             'Amount': [50000, 52000, 55000, 0, 10000, 25000]
         })
         
         # Dataset missing historical data
-        self.limited_history_data = pd.DataFrame({
-            'Date': ['2024-02-29', '2024-03-31'],
+        cls.limited_history_data = pd.DataFrame({
+            'Date': _month_ends('2024-02-29', 2),
             'Account': ['Limited History Account'] * 2,
             'Amount': [75000, 82000]
         })
+        
+        # Categorical accounts let the engine group on integer codes, and the
+        # whole-unit amounts fit losslessly in int32
+        for name in ('multi_month_data', 'multi_year_data',
+                     'new_account_data', 'limited_history_data'):
+            frame = getattr(cls, name)
+            frame['Account'] = frame['Account'].astype('category')
+            frame['Amount'] = frame['Amount'].astype(np.int32)
+        
+        # Engine results per fixture, filled lazily by get_results
+        cls._results_cache = {}
     
     def test_manual_e2e_mom_detection(self):
         """Manual E2E Test: Upload dataset with multiple months and verify MoM detection."""
         
-        movement_results = run_movement_detection_engine(self.multi_month_data)
+        movement_results = self.get_results('multi_month_data')
         
         # Should successfully detect MoM movements
         self.assertTrue(movement_results['success'])
@@ -458,7 +472,7 @@ class TestMovementDetectionManualE2E(unittest.TestCase):
     def test_manual_e2e_yoy_detection(self):
         """Manual E2E Test: Upload dataset spanning multiple years and verify YoY detection."""
         
-        movement_results = run_movement_detection_engine(self.multi_year_data)
+        movement_results = self.get_results('multi_year_data')
         
         # Should successfully process multi-year data
         self.assertTrue(movement_results['success'])
@@ -478,7 +492,7 @@ class TestMovementDetectionManualE2E(unittest.TestCase):
     def test_manual_e2e_new_account_flagging(self):
         """Manual E2E Test: Dataset with new accounts and verify flagging."""
         
-        movement_results = run_movement_detection_engine(self.new_account_data)
+        movement_results = self.get_results('new_account_data')
         
         self.assertTrue(movement_results['success'])
         
@@ -497,7 +511,7 @@ class TestMovementDetectionManualE2E(unittest.TestCase):
     def test_manual_e2e_missing_historical_data(self):
         """Manual E2E Test: Dataset missing historical data and verify graceful handling."""
         
-        movement_results = run_movement_detection_engine(self.limited_history_data)
+        movement_results = self.get_results('limited_history_data')
         
         # Should handle limited data gracefully
         self.assertTrue(movement_results['success'])
@@ -550,33 +564,7 @@ class TestMovementDetectionManualE2E(unittest.TestCase):
 
 
 if __name__ == '__main__':
-    # Set up test suite
-    loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
-    
-    # Add test classes
-    suite.addTests(loader.loadTestsFromTestCase(TestMovementDetectionIntegration))
-    suite.addTests(loader.loadTestsFromTestCase(TestMovementDetectionManualE2E))
-    
-    # Run tests with detailed output
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
-    
-    # Print summary
-    print(f"\n{'='*60}")
-    print(f"INTEGRATION TEST SUMMARY")
-    print(f"{'='*60}")
-    print(f"Tests run: {result.testsRun}")
-    print(f"Failures: {len(result.failures)}")
-    print(f"Errors: {len(result.errors)}")
-    print(f"Success rate: {((result.testsRun - len(result.failures) - len(result.errors)) / result.testsRun * 100):.1f}%")
-    
-    if result.failures:
-        print(f"\nFAILURES:")
-        for test, traceback in result.failures:
-            print(f"- {test}")
-    
-    if result.errors:
-        print(f"\nERRORS:")
-        for test, traceback in result.errors:
-            print(f"- {test}")
\ No newline at end of file
+    # The classes share no mutable state, so spread them across cores when
+    # pytest-xdist is installed
+    xdist_args = ['-n', 'auto', '--dist=loadfile'] if importlib.util.find_spec('xdist') else []
+    sys.exit(pytest.main([__file__, *xdist_args]))